@@ -1,38 +1,134 @@
 # app.py
+#
+# Service modules are imported inside each handler so that an invocation only
+# pays for the SQLAlchemy / LLM SDK imports of the command it actually runs.
 
 import os
+import sys
 import argparse
-from services.project_management import create_project, get_projects, create_work_package, get_work_packages, update_project, get_project_by_id, generate_project_status_report
-from services.audit_logging import get_audit_logs
-from services.risk_management import create_risk, get_risks, update_risk, delete_risk
-from services.control_management import create_control, get_controls, update_control, delete_control
-from services.compliance_management import create_compliance_item, get_compliance_items, update_compliance_item, delete_compliance_item, automate_compliance_check
-from services.document_management import create_document, get_documents, update_document, delete_document
-from services.llm_service import LLMService
-from services.user_management import create_user, get_all_users
 import datetime
+import functools
+import re
+
+_YMD_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+@functools.lru_cache(maxsize=256)
+def _parse_ymd(value):
+    """Converts a YYYY-MM-DD string to a date, or returns None for empty input.
+    Used as the argparse type= for every date option.
+
+    Slicing the fixed-width fields is much cheaper than datetime.strptime,
+    which re-parses its format string on every call, and the cache returns the
+    same (immutable) date object for repeated values such as a shared
+    approval date.
+    """
+    if not value:
+        return None
+    if not _YMD_RE.fullmatch(value):
+        raise argparse.ArgumentTypeError(f"invalid date {value!r} (expected YYYY-MM-DD)")
+    try:
+        return datetime.date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}: {e}")
+
+def _basename(path):
+    """Returns the final component of a file path, like os.path.basename but
+    with a single str.rpartition instead of the posixpath/ntpath dispatch.
+    """
+    if os.altsep:
+        path = path.replace(os.altsep, os.sep)
+    return path.rpartition(os.sep)[2]
+
+def _write_lines(lines, batch_size=500):
+    """Writes lines to stdout in batches instead of issuing one print() per row."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            sys.stdout.write("\n".join(batch) + "\n")
+            batch.clear()
+    if batch:
+        sys.stdout.write("\n".join(batch) + "\n")
+
+def _write_json_lines(rows, fields):
+    """Writes each row as a JSON object of the given fields, one per line."""
+    import json
+    encode = json.JSONEncoder(default=str).encode
+    _write_lines(encode({field: getattr(row, field) for field in fields}) for row in rows)
+
+def _read_batch_file(path, required, optional=()):
+    """Loads the JSON array of row objects given to the *-batch commands.
+    Each row must set every field in required (the arguments the matching single
+    add command requires) and may only add fields from optional.
+    Prints an error and returns None if the file can't be read or a row is invalid.
+    """
+    import json
+    try:
+        with open(path, "rb") as f:
+            rows = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: File not found at {path}")
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error reading batch file {path}: {e}")
+        return None
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        print(f"Error: {path} must contain a JSON array of objects.")
+        return None
+    allowed = set(required).union(optional)
+    for number, row in enumerate(rows, 1):
+        missing = [field for field in required if row.get(field) in (None, "")]
+        if missing:
+            print(f"Error: row {number} in {path} is missing required field(s): {', '.join(missing)}")
+            return None
+        unknown = sorted(set(row) - allowed)
+        if unknown:
+            print(f"Error: row {number} in {path} has unknown field(s): {', '.join(unknown)}")
+            return None
+        for field in row.keys() & allowed:
+            if field.endswith("_id") and type(row[field]) is not int:
+                print(f"Error: row {number} in {path}: {field} must be an integer")
+                return None
+    return rows
+
+def _is_foreign_key_error(e):
+    """True if an IntegrityError was raised by a foreign key constraint."""
+    return "foreign key" in str(e.orig).lower()
+
+def _print_add_integrity_error(e, parent, parent_id):
+    """Reports an IntegrityError raised while adding a record under the given parent."""
+    if _is_foreign_key_error(e):
+        print(f"{parent} with ID {parent_id} not found.")
+    else:
+        print(f"Error: {e.orig}")
+
+def _print_batch_integrity_error(e, records, parent_field):
+    """Reports an IntegrityError that rolled back a *-batch insert."""
+    if _is_foreign_key_error(e):
+        print(f"Error: no {records} were created; a {parent_field} in the file does not match an existing record.")
+    else:
+        print(f"Error: no {records} were created: {e.orig}")
 
 def list_projects(args):
     """Lists all projects."""
-    projects = get_projects()
-    for project in projects:
-        print(f"- {project.name} (ID: {project.id})")
+    from services.project_management import iter_projects
+    rows = iter_projects()
+    if args.json:
+        _write_json_lines(rows, ("id", "name", "description", "pin_id", "start_date", "end_date", "sdlc_model", "ciso_approved"))
+    else:
+        _write_lines(f"- {project.name} (ID: {project.id})" for project in rows)
 
 def add_project(args):
     """Adds a new project."""
-    # Convert date strings to date objects
-    start_date = datetime.datetime.strptime(args.start_date, '%Y-%m-%d').date() if args.start_date else None
-    end_date = datetime.datetime.strptime(args.end_date, '%Y-%m-%d').date() if args.end_date else None
-    ciso_approval_date = datetime.datetime.strptime(args.ciso_approval_date, '%Y-%m-%d').date() if args.ciso_approval_date else None
-
+    from services.project_management import create_project
     project = create_project(
         name=args.name,
         description=args.description,
         pin_id=args.pin_id,
         scope=args.scope,
         milestones=args.milestones,
-        start_date=start_date,
-        end_date=end_date,
+        start_date=args.start_date,
+        end_date=args.end_date,
         effort_estimation=args.effort_estimation,
         deliverables=args.deliverables,
         team_members=args.team_members,
@@ -40,17 +136,13 @@ def add_project(args):
         roles_responsibilities=args.roles_responsibilities,
         sdlc_model=args.sdlc_model,
         ciso_approved=args.ciso_approved,
-        ciso_approval_date=ciso_approval_date
+        ciso_approval_date=args.ciso_approval_date
     )
     print(f"Successfully created project '{project.name}'.")
 
 def update_project_cmd(args):
     """Updates an existing project."""
-    # Convert date strings to date objects
-    start_date = datetime.datetime.strptime(args.start_date, '%Y-%m-%d').date() if args.start_date else None
-    end_date = datetime.datetime.strptime(args.end_date, '%Y-%m-%d').date() if args.end_date else None
-    ciso_approval_date = datetime.datetime.strptime(args.ciso_approval_date, '%Y-%m-%d').date() if args.ciso_approval_date else None
-
+    from services.project_management import update_project
     project = update_project(
         project_id=args.project_id,
         name=args.name,
@@ -58,8 +150,8 @@ def update_project_cmd(args):
         pin_id=args.pin_id,
         scope=args.scope,
         milestones=args.milestones,
-        start_date=start_date,
-        end_date=end_date,
+        start_date=args.start_date,
+        end_date=args.end_date,
         effort_estimation=args.effort_estimation,
         deliverables=args.deliverables,
         team_members=args.team_members,
@@ -67,7 +159,7 @@ def update_project_cmd(args):
         roles_responsibilities=args.roles_responsibilities,
         sdlc_model=args.sdlc_model,
         ciso_approved=args.ciso_approved,
-        ciso_approval_date=ciso_approval_date
+        ciso_approval_date=args.ciso_approval_date
     )
     if project:
         print(f"Successfully updated project '{project.name}'.")
@@ -76,17 +168,27 @@ def update_project_cmd(args):
 
 def list_work_packages(args):
     """Lists all work packages for a project."""
-    work_packages = get_work_packages(args.project_id)
-    for wp in work_packages:
-        print(f"- {wp.subject} (ID: {wp.id})")
+    from services.project_management import iter_work_packages
+    rows = iter_work_packages(args.project_id)
+    if args.json:
+        _write_json_lines(rows, ("id", "project_id", "subject", "description"))
+    else:
+        _write_lines(f"- {wp.subject} (ID: {wp.id})" for wp in rows)
 
 def add_work_package(args):
     """Adds a new work package to a project."""
-    work_package = create_work_package(args.project_id, args.subject, args.description)
+    from services.project_management import create_work_package
+    from sqlalchemy.exc import IntegrityError
+    try:
+        work_package = create_work_package(args.project_id, args.subject, args.description)
+    except IntegrityError as e:
+        _print_add_integrity_error(e, "Project", args.project_id)
+        return
     print(f"Successfully created work package '{work_package.subject}'.")
 
 def generate_project_report_cmd(args):
     """Generates a status report for a project."""
+    from services.project_management import generate_project_status_report
     print(f"Generating status report for project ID: {args.project_id}...")
     report = generate_project_status_report(args.project_id)
     print("\n--- Project Status Report ---\n")
@@ -95,23 +197,50 @@ def generate_project_report_cmd(args):
 
 def list_audit_logs(args):
     """Lists all audit logs, optionally filtered by project."""
-    logs = get_audit_logs(args.project_id)
-    for log in logs:
-        print(f"[{log.timestamp}] Project ID: {log.project_id}, Action: {log.action}, Details: {log.details}")
+    from services.audit_logging import iter_audit_logs
+    rows = iter_audit_logs(args.project_id)
+    if args.json:
+        _write_json_lines(rows, ("id", "timestamp", "project_id", "action", "details"))
+    else:
+        _write_lines(f"[{log.timestamp}] Project ID: {log.project_id}, Action: {log.action}, Details: {log.details}" for log in rows)
 
 def add_risk(args):
     """Adds a new risk to a project."""
-    risk = create_risk(args.project_id, args.name, args.description, args.severity, args.likelihood, args.status)
+    from services.risk_management import create_risk
+    from sqlalchemy.exc import IntegrityError
+    try:
+        risk = create_risk(args.project_id, args.name, args.description, args.severity, args.likelihood, args.status)
+    except IntegrityError as e:
+        _print_add_integrity_error(e, "Project", args.project_id)
+        return
     print(f"Successfully created risk '{risk.name}'.")
 
+def add_risks_batch(args):
+    """Adds risks from a JSON file in a single transaction."""
+    from services.risk_management import create_risks_bulk
+    from sqlalchemy.exc import IntegrityError
+    rows = _read_batch_file(args.file, ("project_id", "name", "description", "severity", "likelihood", "status"))
+    if rows is None:
+        return
+    try:
+        count = create_risks_bulk(rows)
+    except IntegrityError as e:
+        _print_batch_integrity_error(e, "risks", "project_id")
+        return
+    print(f"Successfully created {count} risks.")
+
 def list_risks(args):
     """Lists all risks, optionally filtered by project."""
-    risks = get_risks(args.project_id)
-    for risk in risks:
-        print(f"- {risk.name} (ID: {risk.id}) - Severity: {risk.severity}, Likelihood: {risk.likelihood}, Status: {risk.status}")
+    from services.risk_management import iter_risks
+    rows = iter_risks(args.project_id)
+    if args.json:
+        _write_json_lines(rows, ("id", "project_id", "name", "description", "severity", "likelihood", "status"))
+    else:
+        _write_lines(f"- {risk.name} (ID: {risk.id}) - Severity: {risk.severity}, Likelihood: {risk.likelihood}, Status: {risk.status}" for risk in rows)
 
 def update_risk_cmd(args):
     """Updates an existing risk."""
+    from services.risk_management import update_risk
     risk = update_risk(args.risk_id, args.name, args.description, args.severity, args.likelihood, args.status)
     if risk:
         print(f"Successfully updated risk '{risk.name}'.")
@@ -120,6 +249,7 @@ def update_risk_cmd(args):
 
 def delete_risk_cmd(args):
     """Deletes a risk."""
+    from services.risk_management import delete_risk
     if delete_risk(args.risk_id):
         print(f"Successfully deleted risk with ID {args.risk_id}.")
     else:
@@ -127,17 +257,41 @@ def delete_risk_cmd(args):
 
 def add_control(args):
     """Adds a new control to a risk."""
-    control = create_control(args.risk_id, args.name, args.description, args.type, args.status)
+    from services.control_management import create_control
+    from sqlalchemy.exc import IntegrityError
+    try:
+        control = create_control(args.risk_id, args.name, args.description, args.type, args.status)
+    except IntegrityError as e:
+        _print_add_integrity_error(e, "Risk", args.risk_id)
+        return
     print(f"Successfully created control '{control.name}'.")
 
+def add_controls_batch(args):
+    """Adds controls from a JSON file in a single transaction."""
+    from services.control_management import create_controls_bulk
+    from sqlalchemy.exc import IntegrityError
+    rows = _read_batch_file(args.file, ("risk_id", "name", "description", "type", "status"))
+    if rows is None:
+        return
+    try:
+        count = create_controls_bulk(rows)
+    except IntegrityError as e:
+        _print_batch_integrity_error(e, "controls", "risk_id")
+        return
+    print(f"Successfully created {count} controls.")
+
 def list_controls(args):
     """Lists all controls, optionally filtered by risk."""
-    controls = get_controls(args.risk_id)
-    for control in controls:
-        print(f"- {control.name} (ID: {control.id}) - Type: {control.type}, Status: {control.status}")
+    from services.control_management import iter_controls
+    rows = iter_controls(args.risk_id)
+    if args.json:
+        _write_json_lines(rows, ("id", "risk_id", "name", "description", "type", "status"))
+    else:
+        _write_lines(f"- {control.name} (ID: {control.id}) - Type: {control.type}, Status: {control.status}" for control in rows)
 
 def update_control_cmd(args):
     """Updates an existing control."""
+    from services.control_management import update_control
     control = update_control(args.control_id, args.name, args.description, args.type, args.status)
     if control:
         print(f"Successfully updated control '{control.name}'.")
@@ -146,6 +300,7 @@ def update_control_cmd(args):
 
 def delete_control_cmd(args):
     """Deletes a control."""
+    from services.control_management import delete_control
     if delete_control(args.control_id):
         print(f"Successfully deleted control with ID {args.control_id}.")
     else:
@@ -153,17 +308,41 @@ def delete_control_cmd(args):
 
 def add_compliance_item(args):
     """Adds a new compliance item to a project."""
-    compliance_item = create_compliance_item(args.project_id, args.name, args.description, args.standard, args.status)
+    from services.compliance_management import create_compliance_item
+    from sqlalchemy.exc import IntegrityError
+    try:
+        compliance_item = create_compliance_item(args.project_id, args.name, args.description, args.standard, args.status)
+    except IntegrityError as e:
+        _print_add_integrity_error(e, "Project", args.project_id)
+        return
     print(f"Successfully created compliance item '{compliance_item.name}'.")
 
+def add_compliance_items_batch(args):
+    """Adds compliance items from a JSON file in a single transaction."""
+    from services.compliance_management import create_compliance_items_bulk
+    from sqlalchemy.exc import IntegrityError
+    rows = _read_batch_file(args.file, ("project_id", "name", "description", "standard", "status"))
+    if rows is None:
+        return
+    try:
+        count = create_compliance_items_bulk(rows)
+    except IntegrityError as e:
+        _print_batch_integrity_error(e, "compliance items", "project_id")
+        return
+    print(f"Successfully created {count} compliance items.")
+
 def list_compliance_items(args):
     """Lists all compliance items, optionally filtered by project."""
-    compliance_items = get_compliance_items(args.project_id)
-    for item in compliance_items:
-        print(f"- {item.name} (ID: {item.id}) - Standard: {item.standard}, Status: {item.status}")
+    from services.compliance_management import iter_compliance_items
+    rows = iter_compliance_items(args.project_id)
+    if args.json:
+        _write_json_lines(rows, ("id", "project_id", "name", "description", "standard", "status"))
+    else:
+        _write_lines(f"- {item.name} (ID: {item.id}) - Standard: {item.standard}, Status: {item.status}" for item in rows)
 
 def update_compliance_item_cmd(args):
     """Updates an existing compliance item."""
+    from services.compliance_management import update_compliance_item
     item = update_compliance_item(args.compliance_item_id, args.name, args.description, args.standard, args.status)
     if item:
         print(f"Successfully updated compliance item '{item.name}'.")
@@ -172,6 +351,7 @@ def update_compliance_item_cmd(args):
 
 def delete_compliance_item_cmd(args):
     """Deletes a compliance item."""
+    from services.compliance_management import delete_compliance_item
     if delete_compliance_item(args.compliance_item_id):
         print(f"Successfully deleted compliance item with ID {args.compliance_item_id}.")
     else:
@@ -179,20 +359,22 @@ def delete_compliance_item_cmd(args):
 
 def automate_compliance_check_cmd(args):
     """Automates compliance checks, optionally for a specific project."""
+    from services.compliance_management import automate_compliance_check
     print("Running automated compliance checks...")
     result = automate_compliance_check(args.project_id)
     print(result)
 
 def add_document(args):
     """Adds a new document to a project."""
-    approval_date = datetime.datetime.strptime(args.approval_date, '%Y-%m-%d').date() if args.approval_date else None
-    file_content = None
+    from services.document_management import create_document
+    from sqlalchemy.exc import IntegrityError
+    file_obj = None
     original_filename = None
     if args.file_path:
         try:
-            with open(args.file_path, "rb") as f:
-                file_content = f.read()
-            original_filename = os.path.basename(args.file_path)
+            # Opened rather than read so the service can stream it to storage
+            file_obj = open(args.file_path, "rb")
+            original_filename = _basename(args.file_path)
         except FileNotFoundError:
             print(f"Error: File not found at {args.file_path}")
             return
@@ -200,35 +382,74 @@ def add_document(args):
             print(f"Error reading file {args.file_path}: {e}")
             return
 
-    doc = create_document(
-        project_id=args.project_id,
-        name=args.name,
-        type=args.type,
-        version=args.version,
-        file_content=file_content,
-        original_filename=original_filename,
-        approval_status=args.approval_status,
-        approved_by=args.approved_by,
-        approval_date=approval_date
-    )
+    try:
+        doc = create_document(
+            project_id=args.project_id,
+            name=args.name,
+            type=args.type,
+            version=args.version,
+            file_obj=file_obj,
+            original_filename=original_filename,
+            approval_status=args.approval_status,
+            approved_by=args.approved_by,
+            approval_date=args.approval_date
+        )
+    except IntegrityError as e:
+        _print_add_integrity_error(e, "Project", args.project_id)
+        return
+    finally:
+        if file_obj:
+            file_obj.close()
     print(f"Successfully added document '{doc.name}'.")
 
+# Optional fields of an add-documents-batch row and the add-document defaults they take
+DOCUMENT_BATCH_DEFAULTS = {"version": "1.0", "file_path": None, "approval_status": "Pending", "approved_by": None, "approval_date": None}
+
+def add_documents_batch(args):
+    """Adds documents from a JSON file in a single transaction."""
+    from services.document_management import create_documents_bulk
+    from sqlalchemy.exc import IntegrityError
+    rows = _read_batch_file(args.file, ("project_id", "name", "type"), DOCUMENT_BATCH_DEFAULTS)
+    if rows is None:
+        return
+    try:
+        # Same defaults as add-document, so every row inserts the same columns
+        rows = [{**DOCUMENT_BATCH_DEFAULTS, **row} for row in rows]
+        for row in rows:
+            if row["approval_date"] is not None:
+                row["approval_date"] = _parse_ymd(row["approval_date"])
+    except argparse.ArgumentTypeError as e:
+        print(f"Error: {e}")
+        return
+    try:
+        count = create_documents_bulk(rows)
+    except FileNotFoundError as e:
+        print(f"Error: File not found at {e.filename}")
+        return
+    except IntegrityError as e:
+        _print_batch_integrity_error(e, "documents", "project_id")
+        return
+    print(f"Successfully added {count} documents.")
+
 def list_documents(args):
     """Lists all documents, optionally filtered by project."""
-    docs = get_documents(args.project_id)
-    for doc in docs:
-        print(f"- {doc.name} (ID: {doc.id}) - Type: {doc.type}, Version: {doc.version}, Status: {doc.approval_status}")
+    from services.document_management import iter_documents
+    rows = iter_documents(args.project_id)
+    if args.json:
+        _write_json_lines(rows, ("id", "project_id", "name", "type", "version", "link", "approval_status", "approved_by", "approval_date"))
+    else:
+        _write_lines(f"- {doc.name} (ID: {doc.id}) - Type: {doc.type}, Version: {doc.version}, Status: {doc.approval_status}" for doc in rows)
 
 def update_document_cmd(args):
     """Updates an existing document."""
-    approval_date = datetime.datetime.strptime(args.approval_date, '%Y-%m-%d').date() if args.approval_date else None
-    file_content = None
+    from services.document_management import update_document
+    file_obj = None
     original_filename = None
     if args.file_path:
         try:
-            with open(args.file_path, "rb") as f:
-                file_content = f.read()
-            original_filename = os.path.basename(args.file_path)
+            # Opened rather than read so the service can stream it to storage
+            file_obj = open(args.file_path, "rb")
+            original_filename = _basename(args.file_path)
         except FileNotFoundError:
             print(f"Error: File not found at {args.file_path}")
             return
@@ -236,17 +457,21 @@ def update_document_cmd(args):
             print(f"Error reading file {args.file_path}: {e}")
             return
 
-    doc = update_document(
-        doc_id=args.doc_id,
-        name=args.name,
-        type=args.type,
-        version=args.version,
-        file_content=file_content,
-        original_filename=original_filename,
-        approval_status=args.approval_status,
-        approved_by=args.approved_by,
-        approval_date=approval_date
-    )
+    try:
+        doc = update_document(
+            doc_id=args.doc_id,
+            name=args.name,
+            type=args.type,
+            version=args.version,
+            file_obj=file_obj,
+            original_filename=original_filename,
+            approval_status=args.approval_status,
+            approved_by=args.approved_by,
+            approval_date=args.approval_date
+        )
+    finally:
+        if file_obj:
+            file_obj.close()
     if doc:
         print(f"Successfully updated document '{doc.name}'.")
     else:
@@ -254,240 +479,544 @@ def update_document_cmd(args):
 
 def delete_document_cmd(args):
     """Deletes a document."""
+    from services.document_management import delete_document
     if delete_document(args.doc_id):
         print(f"Successfully deleted document with ID {args.doc_id}.")
     else:
         print(f"Document with ID {args.doc_id} not found.")
 
+@functools.lru_cache(maxsize=1)
+def _llm():
+    """Returns the process-wide LLMService, creating it on first use."""
+    from services.llm_service import LLMService
+    return LLMService()
+
 def generate_document_cmd(args):
     """Generates a document using the LLM."""
-    llm_service = LLMService()
+    llm_service = _llm()
     document = llm_service.generate_document(args.prompt, args.project_id)
     print("\nGenerated Document:\n")
     print(document)
 
 def assess_risk_cmd(args):
     """Assesses a risk using the LLM."""
-    llm_service = LLMService()
+    llm_service = _llm()
     assessment = llm_service.assess_risk(args.risk_description, args.project_id)
     print("\nRisk Assessment:\n")
     print(assessment)
 
 def list_llm_models_cmd(args):
     """Lists available LLM models."""
+    from services.llm_service import LLMService
     LLMService.list_available_models()
 
 def create_user_cmd(args):
     """Creates a new user (Admin only)."""
-    user = create_user(args.username, args.password, args.role)
-    print(f"User '{user.username}' ({user.role}) created successfully.")
+    from services.user_management import create_user
+    user = create_user(args.username, args.password)
+    print(f"User '{user.username}' created successfully.")
 
 def list_users_cmd(args):
     """Lists all users (Admin only)."""
-    users = get_all_users()
-    for user in users:
-        print(f"- {user.username} (ID: {user.id}, Role: {user.role})")
-
-def main():
-    """The main function of the application."""
-    parser = argparse.ArgumentParser(description="Project Audit Tool")
-    subparsers = parser.add_subparsers(dest="command")
+    from services.user_management import iter_users
+    rows = iter_users()
+    if args.json:
+        _write_json_lines(rows, ("id", "username"))
+    else:
+        _write_lines(f"- {user.username} (ID: {user.id})" for user in rows)
 
+# Declarative definition of every subcommand: its help text, handler and the
+# (name, add_argument kwargs) of each argument. A command can be listed from its
+# help text alone; its arguments are only added when it is actually invoked.
+SPECS = {
     # Project Management Commands
-    list_projects_parser = subparsers.add_parser("list-projects", help="Lists all projects.")
-    list_projects_parser.set_defaults(func=list_projects)
-
-    add_project_parser = subparsers.add_parser("add-project", help="Adds a new project with detailed initiation.")
-    add_project_parser.add_argument("name", help="The name of the project.")
-    add_project_parser.add_argument("description", help="The description of the project.")
-    add_project_parser.add_argument("--pin-id", help="Project Initiation Note ID.", required=False)
-    add_project_parser.add_argument("--scope", help="Project scope.", required=False)
-    add_project_parser.add_argument("--milestones", help="Project milestones.", required=False)
-    add_project_parser.add_argument("--start-date", help="Project start date (YYYY-MM-DD).", required=False)
-    add_project_parser.add_argument("--end-date", help="Project end date (YYYY-MM-DD).", required=False)
-    add_project_parser.add_argument("--effort-estimation", help="Effort estimation.", required=False)
-    add_project_parser.add_argument("--deliverables", help="Project deliverables.", required=False)
-    add_project_parser.add_argument("--team-members", help="Comma-separated team members.", required=False)
-    add_project_parser.add_argument("--team-size", type=int, help="Size of the team.", required=False)
-    add_project_parser.add_argument("--roles-responsibilities", help="Roles and responsibilities.", required=False)
-    add_project_parser.add_argument("--sdlc-model", help="SDLC model (e.g., Agile, Waterfall).", required=False)
-    add_project_parser.add_argument("--ciso-approved", type=bool, help="CISO approval status (True/False).", required=False, default=False)
-    add_project_parser.add_argument("--ciso-approval-date", help="CISO approval date (YYYY-MM-DD).", required=False)
-    add_project_parser.set_defaults(func=add_project)
-
-    update_project_parser = subparsers.add_parser("update-project", help="Updates an existing project with detailed initiation.")
-    update_project_parser.add_argument("project_id", type=int, help="The ID of the project to update.")
-    update_project_parser.add_argument("--name", help="The name of the project.", required=False)
-    update_project_parser.add_argument("--description", help="The description of the project.", required=False)
-    update_project_parser.add_argument("--pin-id", help="Project Initiation Note ID.", required=False)
-    update_project_parser.add_argument("--scope", help="Project scope.", required=False)
-    update_project_parser.add_argument("--milestones", help="Project milestones.", required=False)
-    update_project_parser.add_argument("--start-date", help="Project start date (YYYY-MM-DD).", required=False)
-    update_project_parser.add_argument("--end-date", help="Project end date (YYYY-MM-DD).", required=False)
-    update_project_parser.add_argument("--effort-estimation", help="Effort estimation.", required=False)
-    update_project_parser.add_argument("--deliverables", help="Project deliverables.", required=False)
-    update_project_parser.add_argument("--team-members", help="Comma-separated team members.", required=False)
-    update_project_parser.add_argument("--team-size", type=int, help="Size of the team.", required=False)
-    update_project_parser.add_argument("--roles-responsibilities", help="Roles and responsibilities.", required=False)
-    update_project_parser.add_argument("--sdlc-model", help="SDLC model (e.g., Agile, Waterfall).", required=False)
-    update_project_parser.add_argument("--ciso-approved", type=bool, help="CISO approval status (True/False).", required=False)
-    update_project_parser.add_argument("--ciso-approval-date", help="CISO approval date (YYYY-MM-DD).", required=False)
-    update_project_parser.set_defaults(func=update_project_cmd)
-
-    list_work_packages_parser = subparsers.add_parser("list-work-packages", help="Lists all work packages for a project.")
-    list_work_packages_parser.add_argument("project_id", type=int, help="The ID of the project.")
-    list_work_packages_parser.set_defaults(func=list_work_packages)
-
-    add_work_package_parser = subparsers.add_parser("add-work-package", help="Adds a new work package to a project.")
-    add_work_package_parser.add_argument("project_id", type=int, help="The ID of the project.")
-    add_work_package_parser.add_argument("subject", help="The subject of the work package.")
-    add_work_package_parser.add_argument("description", help="The description of the work package.")
-    add_work_package_parser.set_defaults(func=add_work_package)
-
-    generate_report_parser = subparsers.add_parser("generate-project-report", help="Generates a status report for a project using LLM.")
-    generate_report_parser.add_argument("project_id", type=int, help="The ID of the project to generate report for.")
-    generate_report_parser.set_defaults(func=generate_project_report_cmd)
-
+    "list-projects": {
+        "help": "Lists all projects.",
+        "func": list_projects,
+        "args": (
+            ("--json", {"action": "store_true", "help": "Output one JSON object per line."}),
+        ),
+    },
+    "add-project": {
+        "help": "Adds a new project with detailed initiation.",
+        "func": add_project,
+        "args": (
+            ("name", {"help": "The name of the project."}),
+            ("description", {"help": "The description of the project."}),
+            ("--pin-id", {"help": "Project Initiation Note ID.", "required": False}),
+            ("--scope", {"help": "Project scope.", "required": False}),
+            ("--milestones", {"help": "Project milestones.", "required": False}),
+            ("--start-date", {"type": _parse_ymd, "help": "Project start date (YYYY-MM-DD).", "required": False}),
+            ("--end-date", {"type": _parse_ymd, "help": "Project end date (YYYY-MM-DD).", "required": False}),
+            ("--effort-estimation", {"help": "Effort estimation.", "required": False}),
+            ("--deliverables", {"help": "Project deliverables.", "required": False}),
+            ("--team-members", {"help": "Comma-separated team members.", "required": False}),
+            ("--team-size", {"type": int, "help": "Size of the team.", "required": False}),
+            ("--roles-responsibilities", {"help": "Roles and responsibilities.", "required": False}),
+            ("--sdlc-model", {"help": "SDLC model (e.g., Agile, Waterfall).", "required": False}),
+            ("--ciso-approved", {"type": bool, "help": "CISO approval status (True/False).", "required": False, "default": False}),
+            ("--ciso-approval-date", {"type": _parse_ymd, "help": "CISO approval date (YYYY-MM-DD).", "required": False}),
+        ),
+    },
+    "update-project": {
+        "help": "Updates an existing project with detailed initiation.",
+        "func": update_project_cmd,
+        "args": (
+            ("project_id", {"type": int, "help": "The ID of the project to update."}),
+            ("--name", {"help": "The name of the project.", "required": False}),
+            ("--description", {"help": "The description of the project.", "required": False}),
+            ("--pin-id", {"help": "Project Initiation Note ID.", "required": False}),
+            ("--scope", {"help": "Project scope.", "required": False}),
+            ("--milestones", {"help": "Project milestones.", "required": False}),
+            ("--start-date", {"type": _parse_ymd, "help": "Project start date (YYYY-MM-DD).", "required": False}),
+            ("--end-date", {"type": _parse_ymd, "help": "Project end date (YYYY-MM-DD).", "required": False}),
+            ("--effort-estimation", {"help": "Effort estimation.", "required": False}),
+            ("--deliverables", {"help": "Project deliverables.", "required": False}),
+            ("--team-members", {"help": "Comma-separated team members.", "required": False}),
+            ("--team-size", {"type": int, "help": "Size of the team.", "required": False}),
+            ("--roles-responsibilities", {"help": "Roles and responsibilities.", "required": False}),
+            ("--sdlc-model", {"help": "SDLC model (e.g., Agile, Waterfall).", "required": False}),
+            ("--ciso-approved", {"type": bool, "help": "CISO approval status (True/False).", "required": False}),
+            ("--ciso-approval-date", {"type": _parse_ymd, "help": "CISO approval date (YYYY-MM-DD).", "required": False}),
+        ),
+    },
+    "list-work-packages": {
+        "help": "Lists all work packages for a project.",
+        "func": list_work_packages,
+        "args": (
+            ("project_id", {"type": int, "help": "The ID of the project."}),
+            ("--json", {"action": "store_true", "help": "Output one JSON object per line."}),
+        ),
+    },
+    "add-work-package": {
+        "help": "Adds a new work package to a project.",
+        "func": add_work_package,
+        "args": (
+            ("project_id", {"type": int, "help": "The ID of the project."}),
+            ("subject", {"help": "The subject of the work package."}),
+            ("description", {"help": "The description of the work package."}),
+        ),
+    },
+    "generate-project-report": {
+        "help": "Generates a status report for a project using LLM.",
+        "func": generate_project_report_cmd,
+        "args": (
+            ("project_id", {"type": int, "help": "The ID of the project to generate report for."}),
+        ),
+    },
     # Audit Logging Commands
-    list_audit_logs_parser = subparsers.add_parser("list-audit-logs", help="Lists all audit logs, optionally filtered by project.")
-    list_audit_logs_parser.add_argument("--project-id", type=int, help="The ID of the project to filter by.", required=False)
-    list_audit_logs_parser.set_defaults(func=list_audit_logs)
-
+    "list-audit-logs": {
+        "help": "Lists all audit logs, optionally filtered by project.",
+        "func": list_audit_logs,
+        "args": (
+            ("--project-id", {"type": int, "help": "The ID of the project to filter by.", "required": False}),
+            ("--json", {"action": "store_true", "help": "Output one JSON object per line."}),
+        ),
+    },
     # Risk Management Commands
-    add_risk_parser = subparsers.add_parser("add-risk", help="Adds a new risk to a project.")
-    add_risk_parser.add_argument("project_id", type=int, help="The ID of the project.")
-    add_risk_parser.add_argument("name", help="The name of the risk.")
-    add_risk_parser.add_argument("description", help="The description of the risk.")
-    add_risk_parser.add_argument("severity", help="The severity of the risk (e.g., High, Medium, Low).")
-    add_risk_parser.add_argument("likelihood", help="The likelihood of the risk (e.g., High, Medium, Low).")
-    add_risk_parser.add_argument("status", help="The status of the risk (e.g., Open, Closed, Mitigated).")
-    add_risk_parser.set_defaults(func=add_risk)
-
-    list_risks_parser = subparsers.add_parser("list-risks", help="Lists all risks, optionally filtered by project.")
-    list_risks_parser.add_argument("--project-id", type=int, help="The ID of the project to filter by.", required=False)
-    list_risks_parser.set_defaults(func=list_risks)
-
-    update_risk_parser = subparsers.add_parser("update-risk", help="Updates an existing risk.")
-    update_risk_parser.add_argument("risk_id", type=int, help="The ID of the risk to update.")
-    update_risk_parser.add_argument("--name", help="The new name of the risk.", required=False)
-    update_risk_parser.add_argument("--description", help="The new description of the risk.", required=False)
-    update_risk_parser.add_argument("--severity", help="The new severity of the risk.", required=False)
-    update_risk_parser.add_argument("--likelihood", help="The new likelihood of the risk.", required=False)
-    update_risk_parser.add_argument("--status", help="The new status of the risk.", required=False)
-    update_risk_parser.set_defaults(func=update_risk_cmd)
-
-    delete_risk_parser = subparsers.add_parser("delete-risk", help="Deletes a risk.")
-    delete_risk_parser.add_argument("risk_id", type=int, help="The ID of the risk to delete.")
-    delete_risk_parser.set_defaults(func=delete_risk_cmd)
-
+    "add-risk": {
+        "help": "Adds a new risk to a project.",
+        "func": add_risk,
+        "args": (
+            ("project_id", {"type": int, "help": "The ID of the project."}),
+            ("name", {"help": "The name of the risk."}),
+            ("description", {"help": "The description of the risk."}),
+            ("severity", {"help": "The severity of the risk (e.g., High, Medium, Low)."}),
+            ("likelihood", {"help": "The likelihood of the risk (e.g., High, Medium, Low)."}),
+            ("status", {"help": "The status of the risk (e.g., Open, Closed, Mitigated)."}),
+        ),
+    },
+    "add-risks-batch": {
+        "help": "Adds risks from a JSON file in a single transaction.",
+        "func": add_risks_batch,
+        "args": (
+            ("--file", {"required": True, "help": "Path to a JSON array of risk objects with project_id, name, description, severity, likelihood and status."}),
+        ),
+    },
+    "list-risks": {
+        "help": "Lists all risks, optionally filtered by project.",
+        "func": list_risks,
+        "args": (
+            ("--project-id", {"type": int, "help": "The ID of the project to filter by.", "required": False}),
+            ("--json", {"action": "store_true", "help": "Output one JSON object per line."}),
+        ),
+    },
+    "update-risk": {
+        "help": "Updates an existing risk.",
+        "func": update_risk_cmd,
+        "args": (
+            ("risk_id", {"type": int, "help": "The ID of the risk to update."}),
+            ("--name", {"help": "The new name of the risk.", "required": False}),
+            ("--description", {"help": "The new description of the risk.", "required": False}),
+            ("--severity", {"help": "The new severity of the risk.", "required": False}),
+            ("--likelihood", {"help": "The new likelihood of the risk.", "required": False}),
+            ("--status", {"help": "The new status of the risk.", "required": False}),
+        ),
+    },
+    "delete-risk": {
+        "help": "Deletes a risk.",
+        "func": delete_risk_cmd,
+        "args": (
+            ("risk_id", {"type": int, "help": "The ID of the risk to delete."}),
+        ),
+    },
     # Control Management Commands
-    add_control_parser = subparsers.add_parser("add-control", help="Adds a new control to a risk.")
-    add_control_parser.add_argument("risk_id", type=int, help="The ID of the risk this control mitigates.")
-    add_control_parser.add_argument("name", help="The name of the control.")
-    add_control_parser.add_argument("description", help="The description of the control.")
-    add_control_parser.add_argument("type", help="The type of control (e.g., Preventive, Detective).")
-    add_control_parser.add_argument("status", help="The status of the control (e.g., Implemented, In Progress, Not Implemented).")
-    add_control_parser.set_defaults(func=add_control)
-
-    list_controls_parser = subparsers.add_parser("list-controls", help="Lists all controls, optionally filtered by risk.")
-    list_controls_parser.add_argument("--risk-id", type=int, help="The ID of the risk to filter by.", required=False)
-    list_controls_parser.set_defaults(func=list_controls)
-
-    update_control_parser = subparsers.add_parser("update-control", help="Updates an existing control.")
-    update_control_parser.add_argument("control_id", type=int, help="The ID of the control to update.")
-    update_control_parser.add_argument("--name", help="The new name of the control.", required=False)
-    update_control_parser.add_argument("--description", help="The new description of the control.", required=False)
-    update_control_parser.add_argument("--type", help="The new type of control.", required=False)
-    update_control_parser.add_argument("--status", help="The new status of the control.", required=False)
-    update_control_parser.set_defaults(func=update_control_cmd)
-
-    delete_control_parser = subparsers.add_parser("delete-control", help="Deletes a control.")
-    delete_control_parser.add_argument("control_id", type=int, help="The ID of the control to delete.")
-    delete_control_parser.set_defaults(func=delete_control_cmd)
-
+    "add-control": {
+        "help": "Adds a new control to a risk.",
+        "func": add_control,
+        "args": (
+            ("risk_id", {"type": int, "help": "The ID of the risk this control mitigates."}),
+            ("name", {"help": "The name of the control."}),
+            ("description", {"help": "The description of the control."}),
+            ("type", {"help": "The type of control (e.g., Preventive, Detective)."}),
+            ("status", {"help": "The status of the control (e.g., Implemented, In Progress, Not Implemented)."}),
+        ),
+    },
+    "add-controls-batch": {
+        "help": "Adds controls from a JSON file in a single transaction.",
+        "func": add_controls_batch,
+        "args": (
+            ("--file", {"required": True, "help": "Path to a JSON array of control objects with risk_id, name, description, type and status."}),
+        ),
+    },
+    "list-controls": {
+        "help": "Lists all controls, optionally filtered by risk.",
+        "func": list_controls,
+        "args": (
+            ("--risk-id", {"type": int, "help": "The ID of the risk to filter by.", "required": False}),
+            ("--json", {"action": "store_true", "help": "Output one JSON object per line."}),
+        ),
+    },
+    "update-control": {
+        "help": "Updates an existing control.",
+        "func": update_control_cmd,
+        "args": (
+            ("control_id", {"type": int, "help": "The ID of the control to update."}),
+            ("--name", {"help": "The new name of the control.", "required": False}),
+            ("--description", {"help": "The new description of the control.", "required": False}),
+            ("--type", {"help": "The new type of control.", "required": False}),
+            ("--status", {"help": "The new status of the control.", "required": False}),
+        ),
+    },
+    "delete-control": {
+        "help": "Deletes a control.",
+        "func": delete_control_cmd,
+        "args": (
+            ("control_id", {"type": int, "help": "The ID of the control to delete."}),
+        ),
+    },
     # Compliance Management Commands
-    add_compliance_item_parser = subparsers.add_parser("add-compliance-item", help="Adds a new compliance item to a project.")
-    add_compliance_item_parser.add_argument("project_id", type=int, help="The ID of the project this compliance item belongs to.")
-    add_compliance_item_parser.add_argument("name", help="The name of the compliance item.")
-    add_compliance_item_parser.add_argument("description", help="The description of the compliance item.")
-    add_compliance_item_parser.add_argument("standard", help="The compliance standard (e.g., GDPR, ISO 27001).")
-    add_compliance_item_parser.add_argument("status", help="The status of the compliance item (e.g., Compliant, Non-Compliant, In Progress).")
-    add_compliance_item_parser.set_defaults(func=add_compliance_item)
-
-    list_compliance_items_parser = subparsers.add_parser("list-compliance-items", help="Lists all compliance items, optionally filtered by project.")
-    list_compliance_items_parser.add_argument("--project-id", type=int, help="The ID of the project to filter by.", required=False)
-    list_compliance_items_parser.set_defaults(func=list_compliance_items)
-
-    update_compliance_item_parser = subparsers.add_parser("update-compliance-item", help="Updates an existing compliance item.")
-    update_compliance_item_parser.add_argument("compliance_item_id", type=int, help="The ID of the compliance item to update.")
-    update_compliance_item_parser.add_argument("--name", help="The new name of the compliance item.", required=False)
-    update_compliance_item_parser.add_argument("--description", help="The new description of the compliance item.", required=False)
-    update_compliance_item_parser.add_argument("--standard", help="The new compliance standard.", required=False)
-    update_compliance_item_parser.add_argument("--status", help="The new status of the compliance item.", required=False)
-    update_compliance_item_parser.set_defaults(func=update_compliance_item_cmd)
-
-    delete_compliance_item_parser = subparsers.add_parser("delete-compliance-item", help="Deletes a compliance item.")
-    delete_compliance_item_parser.add_argument("compliance_item_id", type=int, help="The ID of the compliance item to delete.")
-    delete_compliance_item_parser.set_defaults(func=delete_compliance_item_cmd)
-
-    automate_compliance_parser = subparsers.add_parser("automate-compliance", help="Automates compliance checks based on predefined rules.")
-    automate_compliance_parser.add_argument("--project-id", type=int, help="Optional: The ID of the project to run checks for. If omitted, checks all projects.", required=False)
-    automate_compliance_parser.set_defaults(func=automate_compliance_check_cmd)
-
+    "add-compliance-item": {
+        "help": "Adds a new compliance item to a project.",
+        "func": add_compliance_item,
+        "args": (
+            ("project_id", {"type": int, "help": "The ID of the project this compliance item belongs to."}),
+            ("name", {"help": "The name of the compliance item."}),
+            ("description", {"help": "The description of the compliance item."}),
+            ("standard", {"help": "The compliance standard (e.g., GDPR, ISO 27001)."}),
+            ("status", {"help": "The status of the compliance item (e.g., Compliant, Non-Compliant, In Progress)."}),
+        ),
+    },
+    "add-compliance-items-batch": {
+        "help": "Adds compliance items from a JSON file in a single transaction.",
+        "func": add_compliance_items_batch,
+        "args": (
+            ("--file", {"required": True, "help": "Path to a JSON array of compliance item objects with project_id, name, description, standard and status."}),
+        ),
+    },
+    "list-compliance-items": {
+        "help": "Lists all compliance items, optionally filtered by project.",
+        "func": list_compliance_items,
+        "args": (
+            ("--project-id", {"type": int, "help": "The ID of the project to filter by.", "required": False}),
+            ("--json", {"action": "store_true", "help": "Output one JSON object per line."}),
+        ),
+    },
+    "update-compliance-item": {
+        "help": "Updates an existing compliance item.",
+        "func": update_compliance_item_cmd,
+        "args": (
+            ("compliance_item_id", {"type": int, "help": "The ID of the compliance item to update."}),
+            ("--name", {"help": "The new name of the compliance item.", "required": False}),
+            ("--description", {"help": "The new description of the compliance item.", "required": False}),
+            ("--standard", {"help": "The new compliance standard.", "required": False}),
+            ("--status", {"help": "The new status of the compliance item.", "required": False}),
+        ),
+    },
+    "delete-compliance-item": {
+        "help": "Deletes a compliance item.",
+        "func": delete_compliance_item_cmd,
+        "args": (
+            ("compliance_item_id", {"type": int, "help": "The ID of the compliance item to delete."}),
+        ),
+    },
+    "automate-compliance": {
+        "help": "Automates compliance checks based on predefined rules.",
+        "func": automate_compliance_check_cmd,
+        "args": (
+            ("--project-id", {"type": int, "help": "Optional: The ID of the project to run checks for. If omitted, checks all projects.", "required": False}),
+        ),
+    },
     # Document Management Commands
-    add_document_parser = subparsers.add_parser("add-document", help="Adds a new document record to a project.")
-    add_document_parser.add_argument("project_id", type=int, help="The ID of the project this document belongs to.")
-    add_document_parser.add_argument("name", help="The name of the document.")
-    add_document_parser.add_argument("type", help="The type of document (e.g., PIN, SRS, HLD, QAP, Email Approval).")
-    add_document_parser.add_argument("--version", help="The version of the document.", default="1.0")
-    add_document_parser.add_argument("--file-path", help="Path to the document file.", required=False)
-    add_document_parser.add_argument("--approval-status", help="Approval status (e.g., Pending, Approved, Rejected).", default="Pending", required=False)
-    add_document_parser.add_argument("--approved-by", help="Name of the approver.", required=False)
-    add_document_parser.add_argument("--approval-date", help="Approval date (YYYY-MM-DD).", required=False)
-    add_document_parser.set_defaults(func=add_document)
-
-    list_documents_parser = subparsers.add_parser("list-documents", help="Lists all documents, optionally filtered by project.")
-    list_documents_parser.add_argument("--project-id", type=int, help="The ID of the project to filter by.", required=False)
-    list_documents_parser.set_defaults(func=list_documents)
-
-    update_document_parser = subparsers.add_parser("update-document", help="Updates an existing document record.")
-    update_document_parser.add_argument("doc_id", type=int, help="The ID of the document to update.")
-    update_document_parser.add_argument("--name", help="The new name of the document.", required=False)
-    update_document_parser.add_argument("--type", help="The new type of document.", required=False)
-    update_document_parser.add_argument("--version", help="The new version of the document.", required=False)
-    update_document_parser.add_argument("--file-path", help="Path to the new document file (optional).", required=False)
-    update_document_parser.add_argument("--approval-status", help="The new approval status.", required=False)
-    update_document_parser.add_argument("--approved-by", help="The new approver.", required=False)
-    update_document_parser.add_argument("--approval-date", help="The new approval date (YYYY-MM-DD).", required=False)
-    update_document_parser.set_defaults(func=update_document_cmd)
-
-    delete_document_parser = subparsers.add_parser("delete-document", help="Deletes a document record.")
-    delete_document_parser.add_argument("doc_id", type=int, help="The ID of the document to delete.")
-    delete_document_parser.set_defaults(func=delete_document_cmd)
-
+    "add-document": {
+        "help": "Adds a new document record to a project.",
+        "func": add_document,
+        "args": (
+            ("project_id", {"type": int, "help": "The ID of the project this document belongs to."}),
+            ("name", {"help": "The name of the document."}),
+            ("type", {"help": "The type of document (e.g., PIN, SRS, HLD, QAP, Email Approval)."}),
+            ("--version", {"help": "The version of the document.", "default": "1.0"}),
+            ("--file-path", {"help": "Path to the document file.", "required": False}),
+            ("--approval-status", {"help": "Approval status (e.g., Pending, Approved, Rejected).", "default": "Pending", "required": False}),
+            ("--approved-by", {"help": "Name of the approver.", "required": False}),
+            ("--approval-date", {"type": _parse_ymd, "help": "Approval date (YYYY-MM-DD).", "required": False}),
+        ),
+    },
+    "add-documents-batch": {
+        "help": "Adds document records from a JSON file in a single transaction.",
+        "func": add_documents_batch,
+        "args": (
+            ("--file", {"required": True, "help": "Path to a JSON array of document objects with project_id, name, type and optionally version, file_path, approval_status, approved_by and approval_date (YYYY-MM-DD)."}),
+        ),
+    },
+    "list-documents": {
+        "help": "Lists all documents, optionally filtered by project.",
+        "func": list_documents,
+        "args": (
+            ("--project-id", {"type": int, "help": "The ID of the project to filter by.", "required": False}),
+            ("--json", {"action": "store_true", "help": "Output one JSON object per line."}),
+        ),
+    },
+    "update-document": {
+        "help": "Updates an existing document record.",
+        "func": update_document_cmd,
+        "args": (
+            ("doc_id", {"type": int, "help": "The ID of the document to update."}),
+            ("--name", {"help": "The new name of the document.", "required": False}),
+            ("--type", {"help": "The new type of document.", "required": False}),
+            ("--version", {"help": "The new version of the document.", "required": False}),
+            ("--file-path", {"help": "Path to the new document file (optional).", "required": False}),
+            ("--approval-status", {"help": "The new approval status.", "required": False}),
+            ("--approved-by", {"help": "The new approver.", "required": False}),
+            ("--approval-date", {"type": _parse_ymd, "help": "The new approval date (YYYY-MM-DD).", "required": False}),
+        ),
+    },
+    "delete-document": {
+        "help": "Deletes a document record.",
+        "func": delete_document_cmd,
+        "args": (
+            ("doc_id", {"type": int, "help": "The ID of the document to delete."}),
+        ),
+    },
     # LLM Integration Commands
-    generate_document_parser = subparsers.add_parser("generate-document", help="Generates a document using the LLM.")
-    generate_document_parser.add_argument("prompt", help="The prompt for document generation.")
-    generate_document_parser.add_argument("--project-id", type=int, help="The ID of the project to use for context.", required=False)
-    generate_document_parser.set_defaults(func=generate_document_cmd)
-
-    assess_risk_parser = subparsers.add_parser("assess-risk", help="Assesses a risk using the LLM.")
-    assess_risk_parser.add_argument("risk_description", help="The description of the risk to assess.")
-    assess_risk_parser.add_argument("--project-id", type=int, help="The ID of the project to use for context.", required=False)
-    assess_risk_parser.set_defaults(func=assess_risk_cmd)
+    "generate-document": {
+        "help": "Generates a document using the LLM.",
+        "func": generate_document_cmd,
+        "args": (
+            ("prompt", {"help": "The prompt for document generation."}),
+            ("--project-id", {"type": int, "help": "The ID of the project to use for context.", "required": False}),
+        ),
+    },
+    "assess-risk": {
+        "help": "Assesses a risk using the LLM.",
+        "func": assess_risk_cmd,
+        "args": (
+            ("risk_description", {"help": "The description of the risk to assess."}),
+            ("--project-id", {"type": int, "help": "The ID of the project to use for context.", "required": False}),
+        ),
+    },
+    "list-llm-models": {
+        "help": "Lists available LLM models.",
+        "func": list_llm_models_cmd,
+        "args": (),
+    },
+    # User Management Commands
+    "create-user": {
+        "help": "Creates a new user (Admin only).",
+        "func": create_user_cmd,
+        "args": (
+            ("username", {"help": "The username for the new user."}),
+            ("password", {"help": "The password for the new user."}),
+        ),
+    },
+    "list-users": {
+        "help": "Lists all users (Admin only).",
+        "func": list_users_cmd,
+        "args": (
+            ("--json", {"action": "store_true", "help": "Output one JSON object per line."}),
+        ),
+    },
+}
+
+# Pre-rendered output of `app.py --help` (regenerate with
+# `COLUMNS=80 python app.py --help` whenever SPECS changes), so that
+# top-level help is served without building any parser.
+MAIN_HELP = """\
+usage: app.py [-h]
+              {list-projects,add-project,update-project,list-work-packages,add-work-package,generate-project-report,list-audit-logs,add-risk,add-risks-batch,list-risks,update-risk,delete-risk,add-control,add-controls-batch,list-controls,update-control,delete-control,add-compliance-item,add-compliance-items-batch,list-compliance-items,update-compliance-item,delete-compliance-item,automate-compliance,add-document,add-documents-batch,list-documents,update-document,delete-document,generate-document,assess-risk,list-llm-models,create-user,list-users}
+              ...
+
+Project Audit Tool
+
+positional arguments:
+  {list-projects,add-project,update-project,list-work-packages,add-work-package,generate-project-report,list-audit-logs,add-risk,add-risks-batch,list-risks,update-risk,delete-risk,add-control,add-controls-batch,list-controls,update-control,delete-control,add-compliance-item,add-compliance-items-batch,list-compliance-items,update-compliance-item,delete-compliance-item,automate-compliance,add-document,add-documents-batch,list-documents,update-document,delete-document,generate-document,assess-risk,list-llm-models,create-user,list-users}
+    list-projects       Lists all projects.
+    add-project         Adds a new project with detailed initiation.
+    update-project      Updates an existing project with detailed initiation.
+    list-work-packages  Lists all work packages for a project.
+    add-work-package    Adds a new work package to a project.
+    generate-project-report
+                        Generates a status report for a project using LLM.
+    list-audit-logs     Lists all audit logs, optionally filtered by project.
+    add-risk            Adds a new risk to a project.
+    add-risks-batch     Adds risks from a JSON file in a single transaction.
+    list-risks          Lists all risks, optionally filtered by project.
+    update-risk         Updates an existing risk.
+    delete-risk         Deletes a risk.
+    add-control         Adds a new control to a risk.
+    add-controls-batch  Adds controls from a JSON file in a single
+                        transaction.
+    list-controls       Lists all controls, optionally filtered by risk.
+    update-control      Updates an existing control.
+    delete-control      Deletes a control.
+    add-compliance-item
+                        Adds a new compliance item to a project.
+    add-compliance-items-batch
+                        Adds compliance items from a JSON file in a single
+                        transaction.
+    list-compliance-items
+                        Lists all compliance items, optionally filtered by
+                        project.
+    update-compliance-item
+                        Updates an existing compliance item.
+    delete-compliance-item
+                        Deletes a compliance item.
+    automate-compliance
+                        Automates compliance checks based on predefined rules.
+    add-document        Adds a new document record to a project.
+    add-documents-batch
+                        Adds document records from a JSON file in a single
+                        transaction.
+    list-documents      Lists all documents, optionally filtered by project.
+    update-document     Updates an existing document record.
+    delete-document     Deletes a document record.
+    generate-document   Generates a document using the LLM.
+    assess-risk         Assesses a risk using the LLM.
+    list-llm-models     Lists available LLM models.
+    create-user         Creates a new user (Admin only).
+    list-users          Lists all users (Admin only).
+
+options:
+  -h, --help            show this help message and exit
+"""
+
+def _sniff_subcommand(argv):
+    """Returns the subcommand named in argv, or None if there isn't a known one."""
+    for token in argv:
+        if not token.startswith("-"):
+            return token if token in SPECS else None
+    return None
+
+def _identity(value):
+    return value
+
+class _AuditArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that can be pickled for the on-disk parser cache.
+
+    argparse registers a closure as the default type converter, which pickle
+    cannot serialize, so it is replaced with a module-level function.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.register("type", None, _identity)
+
+def _add_subcommand(subparsers, command, with_arguments=True):
+    spec = SPECS[command]
+    subparser = subparsers.add_parser(command, help=spec["help"])
+    if with_arguments:
+        for name, kwargs in spec["args"]:
+            subparser.add_argument(name, **kwargs)
+        subparser.set_defaults(func=spec["func"])
+
+def _build_parser(command=None, listing_only=False):
+    """Builds the CLI parser.
+
+    With a command, only that subcommand is added. Otherwise every subcommand
+    is added, and with listing_only=True just by name and help text, which is
+    all that top-level help and unknown-command errors need.
+    """
+    parser = _AuditArgumentParser(description="Project Audit Tool")
+    subparsers = parser.add_subparsers(dest="command")
+    if command:
+        _add_subcommand(subparsers, command)
+    else:
+        for name in SPECS:
+            _add_subcommand(subparsers, name, with_arguments=not listing_only)
+    return parser
+
+PARSER_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "project_audit_tool", "parser.pkl")
+
+def _parser_cache_key():
+    """Identifies the parser definition; changes whenever app.py or Python changes."""
+    stat = os.stat(__file__)
+    return f"{sys.version}:{stat.st_size}:{stat.st_mtime_ns}"
+
+def _restore_suppress(parser):
+    """Re-links argparse.SUPPRESS after unpickling.
+
+    argparse compares against SUPPRESS by identity, which pickling does not
+    preserve for strings.
+    """
+    if parser.argument_default == argparse.SUPPRESS:
+        parser.argument_default = argparse.SUPPRESS
+    for action in parser._actions:
+        if action.default == argparse.SUPPRESS:
+            action.default = argparse.SUPPRESS
+        if action.help == argparse.SUPPRESS:
+            action.help = argparse.SUPPRESS
+        if isinstance(action, argparse._SubParsersAction):
+            for subparser in action.choices.values():
+                _restore_suppress(subparser)
+
+def _load_cached_parser():
+    """Returns the full parser from the on-disk cache, rebuilding it on a miss."""
+    import pickle
+    key = _parser_cache_key()
+    try:
+        with open(PARSER_CACHE_PATH, "rb") as f:
+            cached_key, parser = pickle.load(f)
+        if cached_key == key:
+            _restore_suppress(parser)
+            return parser
+    except Exception:
+        pass  # Missing, stale or unreadable cache; rebuild below
+
+    parser = _build_parser()
+    try:
+        os.makedirs(os.path.dirname(PARSER_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{PARSER_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, parser), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, PARSER_CACHE_PATH)
+    except Exception as e:
+        print(f"WARNING: Could not write parser cache {PARSER_CACHE_PATH}: {e}", file=sys.stderr)
+    return parser
 
-    list_llm_models_parser = subparsers.add_parser("list-llm-models", help="Lists available LLM models.")
-    list_llm_models_parser.set_defaults(func=list_llm_models_cmd)
+def main():
+    """The main function of the application."""
+    if len(sys.argv) == 2 and sys.argv[1] in ("-h", "--help"):
+        sys.stdout.write(MAIN_HELP)
+        return
 
-    # User Management Commands
-    create_user_parser = subparsers.add_parser("create-user", help="Creates a new user (Admin only).")
-    create_user_parser.add_argument("username", help="The username for the new user.")
-    create_user_parser.add_argument("password", help="The password for the new user.")
-    create_user_parser.add_argument("--role", help="The role of the new user (user or admin).", default="user", required=False)
-    create_user_parser.set_defaults(func=create_user_cmd)
-
-    list_users_parser = subparsers.add_parser("list-users", help="Lists all users (Admin only).")
-    list_users_parser.set_defaults(func=list_users_cmd)
+    if os.getenv("PAT_PARSER_CACHE") == "1":
+        # Opt-in: reuse the full parser pickled by a previous invocation.
+        parser = _load_cached_parser()
+    else:
+        # Only build the arguments of the requested subcommand; for --help, no
+        # command, or an unknown command, just list the available subcommands.
+        command = _sniff_subcommand(sys.argv[1:])
+        parser = _build_parser(command, listing_only=command is None)
 
     args = parser.parse_args()
 
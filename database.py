@@ -1,27 +1,134 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime, Text, Boolean, Date, Enum
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy import create_engine, event, inspect, lambda_stmt, CheckConstraint, Column, Index, Integer, String, ForeignKey, DateTime, Text, Boolean, Date, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, relationship, raiseload, deferred
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql.expression import FunctionElement
 from werkzeug.security import generate_password_hash, check_password_hash
-import datetime
+import functools
+import logging
 import os
 import enum
+import secrets
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///project_audit_tool.db")
 
-engine = create_engine(DATABASE_URL)
+# Number of rows fetched per round trip by the iter_* streaming query helpers.
+STREAM_BATCH_SIZE = 500
+
+# Password hashing method and cost passed to werkzeug. scrypt is memory-hard, so
+# it resists GPU cracking far better than PBKDF2; hashes made with any other
+# method or cost (e.g. legacy pbkdf2:sha256) are upgraded on the next login.
+# Set PW_HASH_METHOD to raise the cost in production or lower it for tests
+# (e.g. "pbkdf2:sha256:1000").
+PASSWORD_HASH_METHOD = os.getenv("PW_HASH_METHOD") or "scrypt:32768:8:1"
+
+@functools.lru_cache(maxsize=1)
+def _dummy_password_hash():
+    return generate_password_hash(secrets.token_hex(16), method=PASSWORD_HASH_METHOD)
+
+def check_dummy_password(password):
+    """Runs a password check that always fails, for logins with no stored hash
+    to check against, so they take as long as a wrong password does.
+    """
+    check_password_hash(_dummy_password_hash(), password)
+    return False
+
+# Connection pool sizing; connections are kept open and reused across sessions.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+# Number of compiled SQL statements the engine keeps for reuse (SQLAlchemy's default is 500).
+QUERY_CACHE_SIZE = 1200
+
+def _engine_options(url):
+    """Returns the create_engine pool options for the given database URL."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        # Streamlit serves each session from its own thread, so pooled
+        # connections must be usable from threads other than their creator.
+        options = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            # An in-memory database only exists on its one connection
+            options["poolclass"] = StaticPool
+        else:
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+        return options
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,  # Transparently replace connections the server has dropped
+        "pool_recycle": 1800,
+    }
+
+engine = create_engine(DATABASE_URL, query_cache_size=QUERY_CACHE_SIZE, **_engine_options(DATABASE_URL))
+if not engine.dialect.supports_statement_cache:
+    logger.warning("The %s dialect does not support SQL compilation caching", engine.dialect.name)
+
+if engine.url.get_backend_name() == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Configures each new SQLite connection.
+        WAL lets readers run alongside a writer, and with synchronous=NORMAL a
+        commit no longer waits for an fsync (still crash-safe in WAL mode).
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Set DB_RAISELOAD=1 (e.g. in CI) to make any relationship that a query didn't
+# explicitly eager-load raise on access, so N+1 lazy loads fail loudly.
+DB_RAISELOAD = os.getenv("DB_RAISELOAD") == "1"
+
+if DB_RAISELOAD:
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    def _raiseload_by_default(orm_execute_state):
+        if orm_execute_state.is_select and not orm_execute_state.is_relationship_load and not orm_execute_state.is_column_load:
+            # Explicit selectinload/joinedload options take precedence over the wildcard
+            orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+class utcnow(FunctionElement):
+    """The current UTC time, computed by the database. Stored timestamps are
+    naive UTC, as datetime.utcnow used to produce.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is UTC
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    # now() is in the session time zone; convert so naive columns hold UTC
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
 Base = declarative_base()
 
-class ProjectRole(enum.Enum):
+class ProjectRole(str, enum.Enum):
     Admin = "Admin"
     Editor = "Editor"
     Viewer = "Viewer"
 
 class UserProjectRole(Base):
     __tablename__ = 'user_project_roles'
+    # Roles are stored as plain strings, validated by the database; ProjectRole
+    # is a str enum, so the loaded values compare equal to its members.
+    __table_args__ = (
+        CheckConstraint("role IN (%s)" % ", ".join(f"'{r.value}'" for r in ProjectRole), name="ck_user_project_roles_role"),
+    )
     user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
     project_id = Column(Integer, ForeignKey('projects.id'), primary_key=True)
-    role = Column(Enum(ProjectRole), nullable=False)
+    role = Column(String(16), nullable=False)
 
     user = relationship("User", back_populates="projects")
     project = relationship("Project", back_populates="users")
@@ -35,20 +142,27 @@ class Project(Base):
 
     # New fields for Project Initiation Note (PIN) details
     pin_id = Column(String, unique=True, nullable=True) # Project Initiation Note ID
-    scope = Column(Text, nullable=True)
-    milestones = Column(Text, nullable=True)
+    # The free-text PIN fields are deferred (group "details") so that listing
+    # projects doesn't fetch them; queries that show them use undefer_group.
+    scope = deferred(Column(Text, nullable=True), group="details")
+    milestones = deferred(Column(Text, nullable=True), group="details")
     start_date = Column(Date, nullable=True)
     end_date = Column(Date, nullable=True)
     effort_estimation = Column(String, nullable=True)
-    deliverables = Column(Text, nullable=True)
-    team_members = Column(Text, nullable=True) # Store as comma-separated or JSON string
+    deliverables = deferred(Column(Text, nullable=True), group="details")
+    team_members = deferred(Column(Text, nullable=True), group="details") # Store as comma-separated or JSON string
     team_size = Column(Integer, nullable=True)
-    roles_responsibilities = Column(Text, nullable=True)
+    roles_responsibilities = deferred(Column(Text, nullable=True), group="details")
     sdlc_model = Column(String, nullable=True) # e.g., Agile, Waterfall
     ciso_approved = Column(Boolean, default=False)
     ciso_approval_date = Column(Date, nullable=True)
 
     users = relationship("UserProjectRole", back_populates="project")
+    work_packages = relationship("WorkPackage", back_populates="project")
+    audit_logs = relationship("AuditLog", back_populates="project")
+    risks = relationship("Risk", back_populates="project")
+    compliance_items = relationship("Compliance", back_populates="project")
+    documents = relationship("Document", back_populates="project")
 
 class WorkPackage(Base):
     __tablename__ = "work_packages"
@@ -56,15 +170,18 @@ class WorkPackage(Base):
     id = Column(Integer, primary_key=True, index=True)
     subject = Column(String, index=True)
     description = Column(String)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
 
     project = relationship("Project", back_populates="work_packages")
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (Index("ix_audit_logs_project_ts", "project_id", "timestamp"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=datetime.datetime.utcnow)
+    # utcnow() is rendered into the INSERT itself, so no Python call is made
+    # per row; server_default covers rows inserted outside the ORM.
+    timestamp = Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
     action = Column(String)
     details = Column(String)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=True) # Project ID can be null for global actions
@@ -73,6 +190,7 @@ class AuditLog(Base):
 
 class Risk(Base):
     __tablename__ = "risks"
+    __table_args__ = (Index("ix_risks_project_status", "project_id", "status"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
@@ -83,6 +201,7 @@ class Risk(Base):
     project_id = Column(Integer, ForeignKey("projects.id"))
 
     project = relationship("Project", back_populates="risks")
+    controls = relationship("Control", back_populates="risk")
 
 class Control(Base):
     __tablename__ = "controls"
@@ -92,7 +211,7 @@ class Control(Base):
     description = Column(String)
     type = Column(String)
     status = Column(String)
-    risk_id = Column(Integer, ForeignKey("risks.id"))
+    risk_id = Column(Integer, ForeignKey("risks.id"), index=True)
 
     risk = relationship("Risk", back_populates="controls")
 
@@ -104,7 +223,7 @@ class Compliance(Base):
     description = Column(String)
     standard = Column(String) # e.g., GDPR, ISO 27001
     status = Column(String) # e.g., Compliant, Non-Compliant, In Progress
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
 
     project = relationship("Project", back_populates="compliance_items")
 
@@ -118,13 +237,24 @@ class User(Base):
     projects = relationship("UserProjectRole", back_populates="user")
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
 
     def check_password(self, password):
+        # werkzeug compares the digests with hmac.compare_digest
+        if not self.password_hash:
+            return check_dummy_password(password)
         return check_password_hash(self.password_hash, password)
 
+    def password_needs_rehash(self):
+        """Returns True if the stored hash wasn't made with PASSWORD_HASH_METHOD."""
+        # Compare against a hash werkzeug made, which spells out any cost
+        # parameters PASSWORD_HASH_METHOD leaves at their defaults
+        method = _dummy_password_hash().partition("$")[0]
+        return (self.password_hash or "").partition("$")[0] != method
+
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (Index("ix_documents_project_type", "project_id", "type"),)
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -135,50 +265,95 @@ class Document(Base):
     approval_status = Column(String, default="Pending") # e.g., Pending, Approved, Rejected
     approved_by = Column(String, nullable=True)
     approval_date = Column(Date, nullable=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
 
     project = relationship("Project", back_populates="documents")
 
-# Define relationships after all classes are defined
-Project.work_packages = relationship("WorkPackage", back_populates="project")
-Project.audit_logs = relationship("AuditLog", back_populates="project")
-Project.risks = relationship("Risk", back_populates="project")
-Project.compliance_items = relationship("Compliance", back_populates="project")
-Project.documents = relationship("Document", back_populates="project")
-Risk.controls = relationship("Control", back_populates="risk")
+def _insert_ignoring_conflicts(table):
+    """Returns a Core INSERT for table that skips rows which already exist, on
+    dialects with ON CONFLICT DO NOTHING (SQLite, PostgreSQL), else a plain INSERT.
+    """
+    if engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return table.insert()
+    return dialect_insert(table).on_conflict_do_nothing()
+
+# Statements run on every init_db call (i.e. every Streamlit rerun). lambda_stmt
+# caches them by the lambda's code location, so they're neither rebuilt nor
+# re-keyed for the compiled cache each time.
+_ADMIN_USER_ID = lambda_stmt(lambda: select(User.id).where(User.username == "admin"))
+_ORPHAN_PROJECTS = lambda_stmt(
+    lambda: select(Project.id, Project.name)
+    .outerjoin(UserProjectRole, UserProjectRole.project_id == Project.id)
+    .where(UserProjectRole.project_id.is_(None))
+)
+
+@functools.lru_cache(maxsize=1)
+def _admin_user_id():
+    """Returns the id of the default admin user (or None), looked up once per process."""
+    with SessionLocal() as db:
+        return db.scalar(_ADMIN_USER_ID)
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_admin_user_id(mapper, connection, target):
+    _admin_user_id.cache_clear()
 
 def assign_admin_to_orphan_projects():
     """Assigns the default admin user to any projects that have no users."""
-    db = SessionLocal()
-    admin_user = db.query(User).filter_by(username="admin").first()
-    if not admin_user:
+    admin_user_id = _admin_user_id()
+    if admin_user_id is None:
         return # No admin user to assign
 
-    projects = db.query(Project).all()
-    for project in projects:
-        if not project.users:
-            admin_role = UserProjectRole(user_id=admin_user.id, project_id=project.id, role=ProjectRole.Admin)
-            db.add(admin_role)
-            print(f"Assigned admin user to orphan project: {project.name}")
-    db.commit()
-    db.close()
+    # Commits on success, rolls back on error, and closes the session either way
+    with SessionLocal.begin() as db:
+        # One LEFT JOIN finds every project without a user role row
+        orphans = db.execute(_ORPHAN_PROJECTS).all()
+        if orphans:
+            # Core executemany; conflicts are skipped so concurrent startups can't collide
+            db.execute(_insert_ignoring_conflicts(UserProjectRole.__table__), [
+                {"user_id": admin_user_id, "project_id": project_id, "role": ProjectRole.Admin.value}
+                for project_id, _ in orphans
+            ])
+    if orphans:
+        logger.info("Assigned admin user to %d orphan project(s): %s", len(orphans), ", ".join(name for _, name in orphans))
 
 def init_db():
     """Initializes the database and creates the tables."""
-    Base.metadata.create_all(bind=engine)
+    inspector = inspect(engine)
+    if not set(Base.metadata.tables).issubset(inspector.get_table_names()):
+        Base.metadata.create_all(bind=engine)
+    else:
+        # Warm start: all tables exist, so skip create_all's per-table checks
+        # and only add indexes that databases created by older versions lack
+        existing_indexes = {index["name"] for indexes in inspector.get_multi_indexes().values() for index in indexes}
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=engine)
 
     # Create a default admin user if one doesn't exist
-    session = SessionLocal()
-    if not session.query(User).filter_by(username="admin").first():
-        admin_user = User(username="admin")
-        admin_user.set_password("admin") # Default password is 'admin'
-        session.add(admin_user)
-        session.commit()
-        print("Default admin user created (username: admin, password: admin)")
-    session.close()
-    
+    if _admin_user_id() is None:
+        # A single INSERT that does nothing if another process created the
+        # admin first, instead of a racy check-then-insert
+        stmt = _insert_ignoring_conflicts(User.__table__).values(
+            username="admin",
+            password_hash=generate_password_hash("admin", method=PASSWORD_HASH_METHOD), # Default password is 'admin'
+        )
+        with SessionLocal.begin() as session:
+            created = session.execute(stmt).rowcount
+        _admin_user_id.cache_clear() # Core inserts don't fire the User mapper events
+        if created:
+            # A warning so it shows even where logging isn't configured
+            logger.warning("Default admin user created (username: admin, password: admin)")
+
     # Assign admin to any projects that don't have a user
     assign_admin_to_orphan_projects()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     init_db()
\ No newline at end of file
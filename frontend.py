@@ -2,29 +2,275 @@
 
 import os
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import pandas as pd
-from services.project_management import get_projects, create_project, create_work_package, get_work_packages, update_project, get_project_by_id, generate_project_status_report
-from services.audit_logging import get_audit_logs
-from services.risk_management import get_risks, create_risk, update_risk, delete_risk
+from services.project_management import get_projects, create_project, create_work_package, get_work_package_counts, update_project, get_project_bundle, generate_project_status_report
+from services.audit_logging import get_audit_log_page, count_audit_logs, iter_audit_logs
+from services.risk_management import get_risks, get_risk_severity_counts, create_risk, update_risk, delete_risk
 from services.control_management import create_control, get_controls, update_control, delete_control
-from services.compliance_management import create_compliance_item, get_compliance_items, update_compliance_item, delete_compliance_item, automate_compliance_check
-from services.document_management import create_document, get_documents, update_document, delete_document
+from services.compliance_management import create_compliance_item, get_compliance_items, get_compliance_status_counts, update_compliance_item, delete_compliance_item, automate_compliance_check
+from services.document_management import create_document, update_document, delete_document, original_filename_from_link
 from services.llm_service import LLMService
-from services.user_management import authenticate_user, create_user, get_all_users, add_user_to_project, remove_user_from_project, get_user_role_for_project, get_users_for_project
-from database import init_db, ProjectRole
+from services.user_management import authenticate_user, create_user, iter_users, add_user_to_project, remove_user_from_project, get_user_role_for_project, get_project_members
+from database import init_db, assign_admin_to_orphan_projects, ProjectRole
 from dotenv import load_dotenv
+import csv
 import datetime
+import functools
+import hashlib
 import io
 import sys
+import time
+import zipfile
+from operator import attrgetter
 
 # Load environment variables from .env file at the very beginning
 load_dotenv()
 
-# Initialize the database when the app starts
-init_db()
+# Initialize the database when the app starts. The script reruns on every
+# interaction, so the schema and admin checks run once per server process.
+@st.cache_resource(show_spinner=False)
+def _init_db_once():
+    init_db()
+
+_init_db_once()
+# Projects created outside the UI (e.g. by the CLI) have no roles; giving them
+# to the admin on every rerun keeps them visible without a server restart.
+# It is a single LEFT JOIN query when there is nothing to assign.
+assign_admin_to_orphan_projects()
 
 st.set_page_config(layout="wide")
 
+DOC_TYPES = ("PIN", "Contract", "SRS", "URS", "RFP", "HLD", "LLD", "QAP", "PMP", "CMP", "Email Approval", "User Guidelines", "Other")
+APPROVAL_STATUSES = ("Pending", "Approved", "Rejected")
+SDLC_MODELS = ("Waterfall", "Agile", "DevOps", "Spiral", "V-Model", "Other")
+COMPLIANCE_STATUSES = ("Compliant", "Non-Compliant", "In Progress")
+RISK_LEVELS = ("Low", "Medium", "High") # used for both severity and likelihood
+RISK_STATUSES = ("Open", "Mitigated", "Closed")
+CONTROL_TYPES = ("Preventive", "Detective", "Corrective")
+CONTROL_STATUSES = ("Implemented", "In Progress", "Not Implemented")
+PROJECT_ROLES = tuple(role.value for role in ProjectRole)
+MIME_BY_EXT = {
+    ".pdf": "application/pdf",
+    ".txt": "text/plain",
+    ".csv": "text/csv",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".eml": "message/rfc822",
+    ".msg": "application/vnd.ms-outlook",
+}
+# Uploads are limited to the file types we can serve back with a proper MIME type
+DOCUMENT_FILE_TYPES = tuple(ext[1:] for ext in MIME_BY_EXT)
+_DOC_TYPE_INDEX = {doc_type: i for i, doc_type in enumerate(DOC_TYPES)}
+_APPROVAL_STATUS_INDEX = {status: i for i, status in enumerate(APPROVAL_STATUSES)}
+
+# --- Cached Data Access ---
+# Every widget interaction reruns the whole script, so the listing queries are
+# memoized for a short time. Call _invalidate_all() after any write.
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_projects():
+    return get_projects()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_work_package_counts():
+    return get_work_package_counts()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_project_bundle(project_id):
+    return get_project_bundle(project_id)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_risks():
+    return get_risks()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_risk_severity_counts():
+    return get_risk_severity_counts()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_controls():
+    return get_controls()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_compliance_items():
+    return get_compliance_items()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_compliance_status_counts():
+    return get_compliance_status_counts()
+
+# Audit logs grow without bound, so they are only ever read a page at a time
+AUDIT_LOG_PAGE_SIZE = 50
+PROJECT_PAGE_SIZE = 50
+AUDIT_LOG_EXPORT_COLUMNS = ("ID", "Timestamp", "Project ID", "Project Name", "Action", "Details")
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_audit_log_page(project_id, limit, offset):
+    return get_audit_log_page(project_id, limit, offset)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_audit_log_count(project_id=None):
+    return count_audit_logs(project_id)
+
+def _audit_log_csv(project_names):
+    """Streams every audit log entry into CSV bytes without loading them all as ORM objects.
+    Handed to st.download_button as a callable, so it only runs when the download is clicked.
+    """
+    rows = ((log.id, log.timestamp, log.project_id, project_names.get(log.project_id, "Unknown Project"), log.action, log.details) for log in iter_audit_logs())
+    return _rows_to_csv_bytes(AUDIT_LOG_EXPORT_COLUMNS, rows)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_user_role(user_id, project_id):
+    return get_user_role_for_project(user_id, project_id)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_project_members(project_id):
+    return get_project_members(project_id)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_users():
+    # (id, username) rows only; the pages never need the User objects or their hashes
+    return list(iter_users())
+
+def _listing_signature(rows):
+    """Cheap fingerprint of a cached listing that changes when rows are added or removed."""
+    return len(rows), max((row.id for row in rows), default=0)
+
+# Name maps are shared by several tabs. Callers pass _listing_signature() of
+# the listing they display so an added or removed row rebuilds the map at once;
+# renames don't change the signature and are picked up when the map expires,
+# on the same TTL as the listings.
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_project_names(signature):
+    return {p.id: p.name for p in _cached_projects()}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_risk_names(signature):
+    return {r.id: r.name for r in _cached_risks()}
+
+# One client for all sessions; building it configures the SDK and the model
+@st.cache_resource(show_spinner=False)
+def _cached_llm_service():
+    return LLMService()
+
+def _set_session_flag(key):
+    """Widget callback that sets a session_state flag before the rerun it triggers."""
+    st.session_state[key] = True
+
+def _rerun_fragment():
+    """Reruns just the calling fragment; on a full-app run, where that is not allowed, reruns the app."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+def _invalidate_all():
+    """Drops all cached listings so the next run reads fresh data."""
+    _cached_projects.clear()
+    _cached_work_package_counts.clear()
+    _cached_project_bundle.clear()
+    _cached_risks.clear()
+    _cached_risk_severity_counts.clear()
+    _cached_controls.clear()
+    _cached_compliance_items.clear()
+    _cached_compliance_status_counts.clear()
+    _cached_audit_log_page.clear()
+    _cached_audit_log_count.clear()
+    _cached_project_names.clear()
+    _cached_risk_names.clear()
+    _cached_users.clear()
+    _cached_user_role.clear()
+    _cached_project_members.clear()
+
+# Tables can grow without bound; only this many rows are sent to the browser
+PREVIEW_ROWS = 200
+
+def _as_categories(df, columns):
+    """Converts fixed-choice string columns to categoricals, which st.dataframe
+    sends to the browser dictionary-encoded instead of as repeated strings.
+    """
+    df[columns] = df[columns].astype("category")
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=20)
+def _export_table(columns, rows):
+    """Builds an export preview table and the full CSV bytes; cached on the row values."""
+    return pd.DataFrame.from_records(rows[:PREVIEW_ROWS], columns=columns), _rows_to_csv_bytes(columns, rows)
+
+def _export_section(title, file_name, total, build):
+    """Renders a CSV download with its preview; build() returns (preview_df, csv_data) and is only called when there are rows.
+    csv_data is the CSV bytes, or a callable that builds them when the download is clicked.
+    """
+    if not total:
+        st.info(f"No {title.lower()} to export.")
+        return
+    export_df, csv_data = build()
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.subheader(f"{title} Data Preview")
+    with col2:
+        st.download_button(
+            label=f"Download {title} as CSV",
+            data=csv_data,
+            file_name=file_name,
+            mime="text/csv",
+        )
+    st.dataframe(export_df)
+    if total > PREVIEW_ROWS:
+        st.caption(f"Showing first {PREVIEW_ROWS} of {total} rows")
+
+def _rows_to_csv_bytes(header, rows):
+    """Encodes rows as UTF-8 CSV straight into a buffer, without a DataFrame copy."""
+    buf = io.BytesIO()
+    text = io.TextIOWrapper(buf, encoding="utf-8", newline="")
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    text.detach() # flushes into buf without closing it
+    return buf.getvalue()
+
+# Seconds a repeated LLM request in the same session is answered from memory
+LLM_RESPONSE_TTL = 15 * 60
+
+def _write_llm_response(kind, text, project_id, stream):
+    """Writes this session's earlier response to the same request, or streams stream(text, project_id) and stores it.
+    A stream that fails part way raises before anything is stored.
+    """
+    cache = st.session_state.setdefault("llm_response_cache", {})
+    key = hashlib.sha1(f"{kind}\0{project_id}\0{text.strip()}".encode()).hexdigest()
+    hit = cache.get(key)
+    if hit and time.monotonic() - hit[0] < LLM_RESPONSE_TTL:
+        st.write(hit[1])
+        return
+    response = st.write_stream(stream(text, project_id))
+    if isinstance(response, str):
+        cache[key] = (time.monotonic(), response)
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def _zip_files(files):
+    """Compresses (path, name in archive) pairs into an in-memory zip and returns its bytes."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path, name in files:
+            archive.write(path, arcname=name)
+    return buf.getvalue()
+
+def _existing_files(paths):
+    """Returns the subset of paths that exist, with one directory scan per folder."""
+    found = set()
+    for folder in {os.path.dirname(path) for path in paths}:
+        try:
+            with os.scandir(folder or ".") as entries:
+                found.update(os.path.join(folder, entry.name) for entry in entries if entry.is_file())
+        except OSError:
+            continue
+    return found
+
 def login_page():
     st.title("Project Audit Tool")
     with st.form("login_form"):
@@ -41,12 +287,12 @@ def login_page():
                 st.rerun()
             else:
                 st.error("Invalid username or password")
-                st.session_state.logged_in = False
 
 def logout():
     st.session_state.logged_in = False
     st.session_state.user_id = None
     st.session_state.username = None
+    _invalidate_all()
     st.rerun()
 
 def main_app():
@@ -61,20 +307,16 @@ def main_app():
                 logout()
 
     # --- Data Fetching ---
-    all_projects = get_projects()
-    all_risks = get_risks()
-    all_controls = get_controls()
-    all_compliance_items = get_compliance_items()
-    all_audit_logs = get_audit_logs()
-    all_users = get_all_users()
+    # Projects are needed by nearly every tab; everything else is fetched by
+    # the tab that uses it, so only the open tab's data is loaded
+    all_projects = _cached_projects()
+    project_names = _cached_project_names(_listing_signature(all_projects))
 
     def get_project_name(project_id):
-        return next((p.name for p in all_projects if p.id == project_id), "Unknown Project")
-
-    def get_risk_name(risk_id):
-        return next((r.name for r in all_risks if r.id == risk_id), "Unknown Risk")
+        return project_names.get(project_id, "Unknown Project")
 
     # --- Tabs ---
+    # Tab selection triggers a rerun and only the open tab's body is executed
     tab_dashboard, tab_projects, tab_risks, tab_audit, tab_llm, tab_reports, tab_users = st.tabs([
         "Dashboards",
         "Project Management",
@@ -83,10 +325,19 @@ def main_app():
         "LLM Integration",
         "Reports & Export",
         "User Management"
-    ])
+    ], key="main_tabs", on_change="rerun")
 
     # --- Dashboard Tab ---
-    with tab_dashboard:
+    # The dashboard, project, risk and user tabs are fragments: widget
+    # interactions and writes rerun only the tab itself, and other tabs read the
+    # invalidated caches when they are opened. Creating a project changes the
+    # project list held by main_app, so that write reruns the whole app.
+    @st.fragment
+    def render_dashboard_tab():
+        # The dashboard only shows tallies, so it reads grouped counts rather than the listings
+        risk_severity_counts = pd.Series(_cached_risk_severity_counts(), name="count", dtype="int64").rename_axis("severity")
+        compliance_status_counts = pd.Series(_cached_compliance_status_counts(), name="count", dtype="int64").rename_axis("status")
+
         st.header("Overall Dashboards")
 
         st.subheader("Overall Metrics")
@@ -94,9 +345,9 @@ def main_app():
         with col1:
             st.metric(label="📊 Total Projects", value=len(all_projects))
         with col2:
-            st.metric(label="🚨 Total Risks", value=len(all_risks))
+            st.metric(label="🚨 Total Risks", value=int(risk_severity_counts.sum()))
         with col3:
-            st.metric(label="🛡️ Total Compliance Items", value=len(all_compliance_items))
+            st.metric(label="🛡️ Total Compliance Items", value=int(compliance_status_counts.sum()))
 
         st.markdown("--- ")
 
@@ -105,7 +356,8 @@ def main_app():
         with col1:
             st.subheader("Project Overview")
             if all_projects:
-                project_data = pd.DataFrame([{"Project": p.name, "Work Packages": len(get_work_packages(p.id))} for p in all_projects]).set_index("Project")
+                work_package_counts = _cached_work_package_counts()
+                project_data = pd.DataFrame([{"Project": p.name, "Work Packages": work_package_counts.get(p.id, 0)} for p in all_projects]).set_index("Project")
                 st.bar_chart(project_data)
                 with st.container(height=200):
                     st.dataframe(project_data, use_container_width=True)
@@ -114,8 +366,7 @@ def main_app():
 
         with col2:
             st.subheader("Risk Overview")
-            if all_risks:
-                risk_severity_counts = pd.Series([r.severity for r in all_risks]).value_counts()
+            if not risk_severity_counts.empty:
                 st.bar_chart(risk_severity_counts)
                 with st.container(height=200):
                     st.dataframe(risk_severity_counts, use_container_width=True)
@@ -126,8 +377,7 @@ def main_app():
 
         with col3:
             st.subheader("Compliance Overview")
-            if all_compliance_items:
-                compliance_status_counts = pd.Series([c.status for c in all_compliance_items]).value_counts()
+            if not compliance_status_counts.empty:
                 st.bar_chart(compliance_status_counts)
                 with st.container(height=200):
                     st.dataframe(compliance_status_counts, use_container_width=True)
@@ -136,11 +386,18 @@ def main_app():
         
         with col4:
             st.subheader("Audit Log Overview")
-            st.metric(label="Total Audit Log Entries", value=len(all_audit_logs))
+            st.metric(label="Total Audit Log Entries", value=_cached_audit_log_count())
 
+    with tab_dashboard:
+        if tab_dashboard.open:
+            render_dashboard_tab()
 
     # --- Project Management Tab ---
-    with tab_projects:
+    @st.fragment
+    def render_project_management_tab():
+        all_users = _cached_users()
+        usernames_by_id = {u.id: u.username for u in all_users}
+
         st.header("Project Management")
 
         with st.expander("Create New Project / Project Initiation Note (PIN)"):
@@ -160,7 +417,7 @@ def main_app():
                 team_members = st.text_area("Team Members")
                 team_size = st.number_input("Team Size", min_value=1, value=1)
                 roles_responsibilities = st.text_area("Roles & Responsibilities")
-                sdlc_model = st.selectbox("SDLC Model", ["Waterfall", "Agile", "DevOps", "Spiral", "V-Model", "Other"])
+                sdlc_model = st.selectbox("SDLC Model", SDLC_MODELS)
                 ciso_approved = st.checkbox("CISO Approved")
                 ciso_approval_date = st.date_input("CISO Approval Date", value=None) if ciso_approved else None
                 
@@ -187,7 +444,8 @@ def main_app():
                             )
                             add_user_to_project(st.session_state.user_id, new_project.id, ProjectRole.Admin)
                             st.success(f"Project '{project_name}' created successfully!")
-                            st.rerun()
+                            _invalidate_all()
+                            st.rerun(scope="app")
                         except Exception as e:
                             st.error(f"Error creating project: {e}")
                     else:
@@ -195,32 +453,33 @@ def main_app():
 
         st.subheader("Existing Projects")
         if all_projects:
-            project_display_data = []
-            for project in all_projects:
-                project_display_data.append({
-                    "ID": project.id,
-                    "Name": project.name,
-                    "Description": project.description,
-                    "PIN ID": project.pin_id or 'N/A',
-                    "Scope": project.scope or 'N/A',
-                    "Start Date": project.start_date or 'N/A',
-                    "End Date": project.end_date or 'N/A',
-                    "CISO Approved": project.ciso_approved
-                })
-            st.dataframe(pd.DataFrame(project_display_data))
+            # Only one page of the summary table is built and sent to the browser
+            page_count = -(-len(all_projects) // PROJECT_PAGE_SIZE)
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="project_list_page") if page_count > 1 else 1
+            page_projects = all_projects[(page - 1) * PROJECT_PAGE_SIZE:page * PROJECT_PAGE_SIZE]
+            # The free-text description is shown in the detailed view below, not in the summary table
+            project_display_df = pd.DataFrame.from_records(
+                map(attrgetter("id", "name", "pin_id", "scope", "start_date", "end_date", "ciso_approved"), page_projects),
+                columns=["ID", "Name", "PIN ID", "Scope", "Start Date", "End Date", "CISO Approved"]
+            )
+            optional_columns = ["PIN ID", "Scope", "Start Date", "End Date"]
+            project_display_df[optional_columns] = project_display_df[optional_columns].fillna('N/A')
+            st.dataframe(project_display_df)
+            if page_count > 1:
+                st.caption(f"Page {page} of {page_count}, {len(all_projects)} projects")
 
             st.markdown("### Detailed Project View")
             selected_project_id_detail = st.selectbox(
                 "Select a Project for Detailed View and Management", 
                 options=[p.id for p in all_projects], 
-                format_func=lambda x: next((p.name for p in all_projects if p.id == x), ""), 
+                format_func=lambda x: project_names[x], 
                 key="detailed_project_select"
             )
 
             if selected_project_id_detail:
-                project = next((p for p in all_projects if p.id == selected_project_id_detail), None)
+                project = _cached_project_bundle(selected_project_id_detail)
                 if project:
-                    current_user_role = get_user_role_for_project(st.session_state.user_id, project.id)
+                    current_user_role = _cached_user_role(st.session_state.user_id, project.id)
                     if not current_user_role:
                         st.warning("You do not have access to this project.")
                     else:
@@ -268,18 +527,18 @@ def main_app():
                         # --- User Management for this Project ---
                         if current_user_role == ProjectRole.Admin:
                             st.markdown("#### 👥 User Management for this Project")
-                            project_users = get_users_for_project(project.id)
-                            st.dataframe(pd.DataFrame([{"User": u.user.username, "Role": u.role.value} for u in project_users]))
+                            st.dataframe(pd.DataFrame.from_records(_cached_project_members(project.id), columns=["User", "Role"]))
 
                             with st.expander("Add User to Project"):
                                 with st.form(f"add_user_form_{project.id}"):
-                                    user_to_add = st.selectbox("Select User", options=[u.id for u in all_users], format_func=lambda x: next((u.username for u in all_users if u.id == x), ""))
-                                    role_to_assign = st.selectbox("Select Role", options=[r.value for r in ProjectRole])
+                                    user_to_add = st.selectbox("Select User", options=[u.id for u in all_users], format_func=lambda x: usernames_by_id[x])
+                                    role_to_assign = st.selectbox("Select Role", options=PROJECT_ROLES)
                                     submitted_add_user = st.form_submit_button("Add User")
                                     if submitted_add_user:
                                         add_user_to_project(user_to_add, project.id, ProjectRole(role_to_assign))
                                         st.success(f"User added to project!")
-                                        st.rerun()
+                                        _invalidate_all()
+                                        _rerun_fragment()
 
                         st.markdown("--- ")
 
@@ -287,13 +546,11 @@ def main_app():
 
                         with col_wp:
                             st.markdown("#### 📦 Work Packages")
-                            work_packages = get_work_packages(project.id)
+                            work_packages = project.work_packages
                             if work_packages:
-                                wp_data = []
-                                for wp in work_packages:
-                                    wp_data.append({"ID": wp.id, "Subject": wp.subject, "Description": wp.description})
+                                wp_df = pd.DataFrame.from_records(map(attrgetter("id", "subject", "description"), work_packages), columns=["ID", "Subject", "Description"])
                                 with st.container(height=300):
-                                    st.dataframe(pd.DataFrame(wp_data), use_container_width=True)
+                                    st.dataframe(wp_df, use_container_width=True)
                             else:
                                 st.info("No work packages for this project.")
 
@@ -308,7 +565,8 @@ def main_app():
                                                 try:
                                                     create_work_package(project.id, wp_subject, wp_description)
                                                     st.success(f"Work package '{wp_subject}' added to {project.name}!")
-                                                    st.rerun()
+                                                    _invalidate_all()
+                                                    _rerun_fragment()
                                                 except Exception as e:
                                                     st.error(f"Error creating work package: {e}")
                                             else:
@@ -316,13 +574,12 @@ def main_app():
 
                         with col_comp:
                             st.markdown("#### 🛡️ Compliance Items")
-                            compliance_items = get_compliance_items(project.id)
+                            compliance_items = project.compliance_items
                             if compliance_items:
-                                comp_data = []
-                                for item in compliance_items:
-                                    comp_data.append({"ID": item.id, "Name": item.name, "Standard": item.standard, "Status": item.status})
+                                comp_df = pd.DataFrame.from_records(map(attrgetter("id", "name", "standard", "status"), compliance_items), columns=["ID", "Name", "Standard", "Status"])
+                                _as_categories(comp_df, ["Standard", "Status"])
                                 with st.container(height=300):
-                                    st.dataframe(pd.DataFrame(comp_data), use_container_width=True)
+                                    st.dataframe(comp_df, use_container_width=True)
                             else:
                                 st.info("No compliance items for this project.")
 
@@ -332,14 +589,15 @@ def main_app():
                                         comp_name = st.text_input("Compliance Item Name")
                                         comp_description = st.text_area("Compliance Item Description")
                                         comp_standard = st.text_input("Compliance Standard (e.g., GDPR, ISO 27001)")
-                                        comp_status = st.selectbox("Compliance Status", ["Compliant", "Non-Compliant", "In Progress"])
+                                        comp_status = st.selectbox("Compliance Status", COMPLIANCE_STATUSES)
                                         submitted_comp = st.form_submit_button("Add Compliance Item")
                                         if submitted_comp:
                                             if comp_name and comp_description and comp_standard:
                                                 try:
                                                     create_compliance_item(project.id, comp_name, comp_description, comp_standard, comp_status)
                                                     st.success(f"Compliance item '{comp_name}' added to {project.name}!")
-                                                    st.rerun()
+                                                    _invalidate_all()
+                                                    _rerun_fragment()
                                                 except Exception as e:
                                                     st.error(f"Error creating compliance item: {e}")
                                             else:
@@ -347,46 +605,58 @@ def main_app():
                         
                         with col_docs:
                             st.markdown("#### 📄 Documents")
-                            documents = get_documents(project.id)
+                            documents = project.documents
+                            docs_by_id = {d.id: d for d in documents}
                             if documents:
-                                doc_data = []
-                                for doc in documents:
-                                    # Extract original filename from the stored link (path)
-                                    original_filename = os.path.basename(doc.link).split("_", 1)[-1] if doc.link else "N/A"
-                                    doc_data.append({
-                                        "ID": doc.id,
-                                        "Name": doc.name,
-                                        "Type": doc.type,
-                                        "Version": doc.version,
-                                        "Approval Status": doc.approval_status,
-                                        "Approved By": doc.approved_by if doc.approved_by else 'N/A',
-                                        "Approval Date": doc.approval_date if doc.approval_date else 'N/A',
-                                        "Original Filename": original_filename,
-                                        "Link": doc.link # Keep link for internal use, not directly displayed
-                                    })
-                                docs_df = pd.DataFrame(doc_data)
+                                # Extract original filenames from the stored links (paths), once for the table and the download buttons
+                                original_filenames = {doc.id: original_filename_from_link(doc.link) if doc.link else "N/A" for doc in documents}
+                                docs_df = pd.DataFrame.from_records(
+                                    map(attrgetter("id", "name", "type", "version", "approval_status", "approved_by", "approval_date"), documents),
+                                    columns=["ID", "Name", "Type", "Version", "Approval Status", "Approved By", "Approval Date"]
+                                )
+                                docs_df[["Approved By", "Approval Date"]] = docs_df[["Approved By", "Approval Date"]].fillna('N/A')
+                                docs_df["Original Filename"] = docs_df["ID"].map(original_filenames)
+                                _as_categories(docs_df, ["Type", "Approval Status"])
                                 with st.container(height=300):
-                                    st.dataframe(docs_df.drop(columns=["Link"]), use_container_width=True)
-
-                                # Add download buttons for each document
-                                st.markdown("**Download Documents:**")
-                                for doc in documents:
-                                    if doc.link and os.path.exists(doc.link):
-                                        try:
-                                            with open(doc.link, "rb") as f:
-                                                bytes_data = f.read()
-                                            original_filename = os.path.basename(doc.link).split("_", 1)[-1]
+                                    st.dataframe(docs_df, use_container_width=True)
+
+                                # Download buttons are built only while the expander is open, so
+                                # the storage folder is not scanned on every rerun
+                                download_docs = st.expander("Download Documents", key=f"download_docs_{project.id}", on_change="rerun")
+                                with download_docs:
+                                    if download_docs.open:
+                                        stored_files = _existing_files([doc.link for doc in documents if doc.link])
+                                        stored_docs = [doc for doc in documents if doc.link in stored_files]
+                                        if len(stored_docs) > 1:
+                                            # Stored names are unique; use them where two uploads share an original name
+                                            archive_entries, used_names = [], set()
+                                            for doc in stored_docs:
+                                                name = original_filenames[doc.id]
+                                                if name in used_names:
+                                                    name = os.path.basename(doc.link)
+                                                used_names.add(name)
+                                                archive_entries.append((doc.link, name))
+                                            # Like the single-file buttons, the archive is only built when clicked
                                             st.download_button(
-                                                label=f"Download {doc.name} ({original_filename})",
-                                                data=bytes_data,
-                                                file_name=original_filename,
-                                                mime="application/octet-stream", # Generic mime type
-                                                key=f"download_doc_{doc.id}"
+                                                label=f"Download all {len(stored_docs)} documents as ZIP",
+                                                data=functools.partial(_zip_files, archive_entries),
+                                                file_name=f"{project.name}_documents.zip",
+                                                mime="application/zip",
+                                                key=f"download_all_docs_{project.id}"
                                             )
-                                        except Exception as e:
-                                            st.warning(f"Could not prepare {doc.name} for download: {e}")
-                                    else:
-                                        st.info(f"File for {doc.name} not found or not uploaded.")
+                                        for doc in documents:
+                                            if doc.link in stored_files:
+                                                original_filename = original_filenames[doc.id]
+                                                # The file is only read when the button is clicked
+                                                st.download_button(
+                                                    label=f"Download {doc.name} ({original_filename})",
+                                                    data=functools.partial(_read_file, doc.link),
+                                                    file_name=original_filename,
+                                                    mime=MIME_BY_EXT.get(os.path.splitext(doc.link)[1].lower(), "application/octet-stream"),
+                                                    key=f"download_doc_{doc.id}"
+                                                )
+                                            else:
+                                                st.info(f"File for {doc.name} not found or not uploaded.")
                             else:
                                 st.info("No documents for this project.")
 
@@ -394,10 +664,10 @@ def main_app():
                                 with st.expander(f"Add New Document to {project.name}"):
                                     with st.form(f"new_document_form_{project.id}"):
                                         doc_name = st.text_input("Document Name*")
-                                        doc_type = st.selectbox("Document Type", ["PIN", "Contract", "SRS", "URS", "RFP", "HLD", "LLD", "QAP", "PMP", "CMP", "Email Approval", "User Guidelines", "Other"])
+                                        doc_type = st.selectbox("Document Type", DOC_TYPES)
                                         doc_version = st.text_input("Version", value="1.0")
-                                        uploaded_file = st.file_uploader("Upload Document File* (PDF, TXT, CSV, Images, EML, MSG)", type=["pdf", "txt", "csv", "png", "jpg", "jpeg", "gif", "eml", "msg"], key=f"doc_uploader_{project.id}")
-                                        doc_approval_status = st.selectbox("Approval Status", ["Pending", "Approved", "Rejected"])
+                                        uploaded_file = st.file_uploader("Upload Document File* (PDF, TXT, CSV, Images, EML, MSG)", type=DOCUMENT_FILE_TYPES, key=f"doc_uploader_{project.id}")
+                                        doc_approval_status = st.selectbox("Approval Status", APPROVAL_STATUSES)
                                         doc_approved_by = st.text_input("Approved By (Name)")
                                         doc_approval_date = st.date_input("Approval Date", value=None)
                                         submitted_doc = st.form_submit_button("Add Document")
@@ -409,14 +679,15 @@ def main_app():
                                                         name=doc_name,
                                                         type=doc_type,
                                                         version=doc_version,
-                                                        file_content=uploaded_file.read(),
+                                                        file_obj=uploaded_file, # streamed to storage, not read into memory
                                                         original_filename=uploaded_file.name,
                                                         approval_status=doc_approval_status,
                                                         approved_by=doc_approved_by if doc_approved_by else None,
                                                         approval_date=doc_approval_date
                                                     )
                                                     st.success(f"Document '{doc_name}' added to {project.name}!")
-                                                    st.rerun()
+                                                    _invalidate_all()
+                                                    _rerun_fragment()
                                                 except Exception as e:
                                                     st.error(f"Error creating document: {e}")
                                             else:
@@ -425,38 +696,27 @@ def main_app():
                                 # Update Document Form (New Expander)
                                 with st.expander(f"Update Existing Document for {project.name}"):
                                     if documents:
-                                        doc_selection_options = {d.id: d.name for d in documents}
-                                        selected_doc_id = st.selectbox("Select Document to Update", options=list(doc_selection_options.keys()), format_func=lambda x: doc_selection_options[x], key=f"update_doc_select_{project.id}")
+                                        selected_doc_id = st.selectbox("Select Document to Update", options=list(docs_by_id), format_func=lambda x: docs_by_id[x].name, key=f"update_doc_select_{project.id}")
                                         
                                         if selected_doc_id:
-                                            selected_doc = next((d for d in documents if d.id == selected_doc_id), None)
+                                            selected_doc = docs_by_id.get(selected_doc_id)
                                             if selected_doc:
                                                 with st.form(f"update_document_form_{selected_doc.id}"):
                                                     st.subheader(f"Update Details for {selected_doc.name}")
                                                     updated_doc_name = st.text_input("Document Name", value=selected_doc.name)
-                                                    doc_types = ["PIN", "Contract", "SRS", "URS", "RFP", "HLD", "LLD", "QAP", "PMP", "CMP", "Email Approval", "User Guidelines", "Other"]
-                                                    try:
-                                                        doc_type_index = doc_types.index(selected_doc.type) if selected_doc.type in doc_types else 0
-                                                    except:
-                                                        doc_type_index = 0
-                                                    updated_doc_type = st.selectbox("Document Type", doc_types, index=doc_type_index)
+                                                    updated_doc_type = st.selectbox("Document Type", DOC_TYPES, index=_DOC_TYPE_INDEX.get(selected_doc.type, 0))
                                                     updated_doc_version = st.text_input("Version", value=selected_doc.version)
-                                                    updated_uploaded_file = st.file_uploader("Upload New Document File (Optional)", type=["pdf", "txt", "csv", "png", "jpg", "jpeg", "gif", "eml", "msg"], key=f"update_doc_uploader_{selected_doc.id}")
-                                                    approval_statuses = ["Pending", "Approved", "Rejected"]
-                                                    try:
-                                                        approval_status_index = approval_statuses.index(selected_doc.approval_status) if selected_doc.approval_status in approval_statuses else 0
-                                                    except:
-                                                        approval_status_index = 0
-                                                    updated_doc_approval_status = st.selectbox("Approval Status", approval_statuses, index=approval_status_index)
+                                                    updated_uploaded_file = st.file_uploader("Upload New Document File (Optional)", type=DOCUMENT_FILE_TYPES, key=f"update_doc_uploader_{selected_doc.id}")
+                                                    updated_doc_approval_status = st.selectbox("Approval Status", APPROVAL_STATUSES, index=_APPROVAL_STATUS_INDEX.get(selected_doc.approval_status, 0))
                                                     updated_doc_approved_by = st.text_input("Approved By (Name)", value=selected_doc.approved_by if selected_doc.approved_by else "")
                                                     updated_doc_approval_date = st.date_input("Approval Date", value=selected_doc.approval_date if selected_doc.approval_date else None)
 
                                                     submitted_update_doc = st.form_submit_button("Update Document")
                                                     if submitted_update_doc:
-                                                        file_content_to_pass = None
+                                                        file_obj_to_pass = None
                                                         original_filename_to_pass = None
                                                         if updated_uploaded_file:
-                                                            file_content_to_pass = updated_uploaded_file.read()
+                                                            file_obj_to_pass = updated_uploaded_file
                                                             original_filename_to_pass = updated_uploaded_file.name
 
                                                         try:
@@ -465,14 +725,15 @@ def main_app():
                                                                 name=updated_doc_name,
                                                                 type=updated_doc_type,
                                                                 version=updated_doc_version,
-                                                                file_content=file_content_to_pass,
+                                                                file_obj=file_obj_to_pass,
                                                                 original_filename=original_filename_to_pass,
                                                                 approval_status=updated_doc_approval_status,
                                                                 approved_by=updated_doc_approved_by if updated_doc_approved_by else None,
                                                                 approval_date=updated_doc_approval_date
                                                             )
                                                             st.success(f"Document '{updated_doc_name}' updated successfully!")
-                                                            st.rerun()
+                                                            _invalidate_all()
+                                                            _rerun_fragment()
                                                         except Exception as e:
                                                             st.error(f"Error updating document: {e}")
                                     else:
@@ -480,17 +741,33 @@ def main_app():
 
                         if current_user_role == ProjectRole.Admin:
                             st.markdown("---")
-                            # Automated Compliance Check Button
-                            if st.button(f"Run Automated Compliance Check for {project.name}", key=f"auto_comp_check_{project.id}"):
-                                with st.spinner(f"Running automated compliance checks for {project.name}..."):
-                                    result = automate_compliance_check(project.id)
-                                    st.success(result)
-                                    st.rerun()
+                            # Automated Compliance Check Button. The click callback sets the flag before
+                            # the rerun, so the button renders disabled while that run does the check.
+                            check_running_key = f"auto_comp_check_running_{project.id}"
+                            check_running = st.session_state.get(check_running_key, False)
+                            st.button(f"Run Automated Compliance Check for {project.name}", key=f"auto_comp_check_{project.id}", disabled=check_running, on_click=_set_session_flag, args=(check_running_key,))
+                            if check_running:
+                                try:
+                                    with st.spinner(f"Running automated compliance checks for {project.name}..."):
+                                        result = automate_compliance_check(project.id)
+                                        st.success(result)
+                                finally:
+                                    st.session_state[check_running_key] = False
+                                _invalidate_all()
+                                _rerun_fragment()
         else:
             st.info("No projects found. Create one above!")
 
+    with tab_projects:
+        if tab_projects.open:
+            render_project_management_tab()
+
     # --- Risk & Control Management Tab ---
-    with tab_risks:
+    @st.fragment
+    def render_risk_control_tab():
+        all_risks = _cached_risks()
+        risks_by_id = {r.id: r for r in all_risks}
+
         st.header("🚨 Risk & Control Management")
 
         with st.expander("Create New Risk"):
@@ -504,16 +781,17 @@ def main_app():
 
                 risk_name = st.text_input("Risk Name")
                 risk_description = st.text_area("Risk Description")
-                risk_severity = st.selectbox("Severity", ["Low", "Medium", "High"])
-                risk_likelihood = st.selectbox("Likelihood", ["Low", "Medium", "High"])
-                risk_status = st.selectbox("Status", ["Open", "Mitigated", "Closed"])
+                risk_severity = st.selectbox("Severity", RISK_LEVELS)
+                risk_likelihood = st.selectbox("Likelihood", RISK_LEVELS)
+                risk_status = st.selectbox("Status", RISK_STATUSES)
                 submitted_risk = st.form_submit_button("Create Risk")
                 if submitted_risk:
                     if risk_project_id and risk_name and risk_description:
                         try:
                             create_risk(risk_project_id, risk_name, risk_description, risk_severity, risk_likelihood, risk_status)
                             st.success(f"Risk '{risk_name}' created successfully!")
-                            st.rerun()
+                            _invalidate_all()
+                            _rerun_fragment()
                         except Exception as e:
                             st.error(f"Error creating risk: {e}")
                     else:
@@ -521,27 +799,22 @@ def main_app():
 
         st.subheader("Existing Risks")
         if all_risks:
-            risk_display_data = []
-            for risk in all_risks:
-                risk_display_data.append({
-                    "ID": risk.id,
-                    "Name": risk.name,
-                    "Project": get_project_name(risk.project_id),
-                    "Description": risk.description,
-                    "Severity": risk.severity,
-                    "Likelihood": risk.likelihood,
-                    "Status": risk.status
-                })
-            st.dataframe(pd.DataFrame(risk_display_data), use_container_width=True)
+            risk_display_df = pd.DataFrame.from_records(
+                map(attrgetter("id", "name", "project_id", "description", "severity", "likelihood", "status"), all_risks),
+                columns=["ID", "Name", "Project", "Description", "Severity", "Likelihood", "Status"]
+            )
+            risk_display_df["Project"] = risk_display_df["Project"].map(project_names).fillna("Unknown Project")
+            _as_categories(risk_display_df, ["Project", "Severity", "Likelihood", "Status"])
+            st.dataframe(risk_display_df, use_container_width=True)
 
             st.markdown("### Detailed Risk View")
             risk_selection_options = {r.id: r.name for r in all_risks}
             selected_risk_id_detail = st.selectbox("Select a Risk for Detailed View and Management", options=list(risk_selection_options.keys()), format_func=lambda x: risk_selection_options[x], key="detailed_risk_select")
 
             if selected_risk_id_detail:
-                risk = next((r for r in all_risks if r.id == selected_risk_id_detail), None)
+                risk = risks_by_id.get(selected_risk_id_detail)
                 if risk:
-                    current_user_role = get_user_role_for_project(st.session_state.user_id, risk.project_id)
+                    current_user_role = _cached_user_role(st.session_state.user_id, risk.project_id)
                     if not current_user_role:
                         st.warning("You do not have access to this risk.")
                     else:
@@ -562,67 +835,74 @@ def main_app():
                         st.markdown("#### 🛡️ Controls")
                         controls = get_controls(risk.id)
                         if controls:
-                            control_data = []
-                            for control in controls:
-                                control_data.append({"ID": control.id, "Name": control.name, "Description": control.description, "Type": control.type, "Status": control.status})
+                            control_df = pd.DataFrame.from_records(map(attrgetter("id", "name", "description", "type", "status"), controls), columns=["ID", "Name", "Description", "Type", "Status"])
+                            _as_categories(control_df, ["Type", "Status"])
                             with st.container(height=300):
-                                st.dataframe(pd.DataFrame(control_data), use_container_width=True)
+                                st.dataframe(control_df, use_container_width=True)
                         else:
                             st.info("No controls for this risk.")
 
                         if current_user_role in [ProjectRole.Admin, ProjectRole.Editor]:
-                            with st.expander(f"Add Control to {risk.name}"):
-                                with st.form(f"new_control_form_{risk.id}"):
-                                    control_name = st.text_input("Control Name")
-                                    control_description = st.text_area("Control Description")
-                                    control_type = st.selectbox("Control Type", ["Preventive", "Detective", "Corrective"])
-                                    control_status = st.selectbox("Control Status", ["Implemented", "In Progress", "Not Implemented"])
-                                    submitted_control = st.form_submit_button("Add Control")
-                                    if submitted_control:
-                                        if control_name and control_description:
-                                            try:
-                                                create_control(risk.id, control_name, control_description, control_type, control_status)
-                                                st.success(f"Control '{control_name}' added to {risk.name}!")
-                                                st.rerun()
-                                            except Exception as e:
-                                                st.error(f"Error creating control: {e}")
-                                        else:
-                                            st.error("Please fill in all control details.")
+                            # Built only while open, so the form widgets are skipped on other reruns
+                            add_control = st.expander(f"Add Control to {risk.name}", key=f"add_control_{risk.id}", on_change="rerun")
+                            with add_control:
+                                if add_control.open:
+                                    with st.form(f"new_control_form_{risk.id}"):
+                                        control_name = st.text_input("Control Name")
+                                        control_description = st.text_area("Control Description")
+                                        control_type = st.selectbox("Control Type", CONTROL_TYPES)
+                                        control_status = st.selectbox("Control Status", CONTROL_STATUSES)
+                                        submitted_control = st.form_submit_button("Add Control")
+                                        if submitted_control:
+                                            if control_name and control_description:
+                                                try:
+                                                    create_control(risk.id, control_name, control_description, control_type, control_status)
+                                                    st.success(f"Control '{control_name}' added to {risk.name}!")
+                                                    _invalidate_all()
+                                                    _rerun_fragment()
+                                                except Exception as e:
+                                                    st.error(f"Error creating control: {e}")
+                                            else:
+                                                st.error("Please fill in all control details.")
         else:
             st.info("No risks found. Create one above!")
 
+    with tab_risks:
+        if tab_risks.open:
+            render_risk_control_tab()
+
     # --- Audit Logs Tab ---
-    with tab_audit:
+    def render_audit_tab():
         st.header("📜 Audit Logs")
         
-        project_options = ["All Projects"] + [p.name for p in all_projects]
-        selected_project_name = st.selectbox("Filter by Project", options=project_options)
-
-        if all_audit_logs:
-            log_data = []
-            for log in all_audit_logs:
-                log_data.append({
-                    "Timestamp": log.timestamp,
-                    "Project ID": log.project_id,
-                    "Project": get_project_name(log.project_id),
-                    "Action": log.action,
-                    "Details": log.details
-                })
-            
-            log_df = pd.DataFrame(log_data)
-
-            if selected_project_name != "All Projects":
-                log_df = log_df[log_df["Project"] == selected_project_name]
+        selected_project_id_logs = st.selectbox("Filter by Project", options=[None] + [p.id for p in all_projects], format_func=lambda x: "All Projects" if x is None else project_names[x])
+        total_logs = _cached_audit_log_count(selected_project_id_logs)
+
+        if total_logs:
+            page_count = -(-total_logs // AUDIT_LOG_PAGE_SIZE)
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key=f"audit_log_page_{selected_project_id_logs}")
+            page_logs = _cached_audit_log_page(selected_project_id_logs, AUDIT_LOG_PAGE_SIZE, (page - 1) * AUDIT_LOG_PAGE_SIZE)
+            log_df = pd.DataFrame.from_records(
+                map(attrgetter("timestamp", "project_id", "action", "details"), page_logs),
+                columns=["Timestamp", "Project ID", "Action", "Details"]
+            )
+            log_df.insert(2, "Project", log_df["Project ID"].map(project_names).fillna("Unknown Project"))
+            _as_categories(log_df, ["Project", "Action"])
 
             st.dataframe(log_df.drop(columns=["Project ID"]), use_container_width=True)
+            st.caption(f"Page {page} of {page_count}, {total_logs} entries, newest first")
         else:
             st.info("No audit logs found.")
 
+    with tab_audit:
+        if tab_audit.open:
+            render_audit_tab()
+
     # --- LLM Integration Tab ---
-    with tab_llm:
+    def render_llm_tab():
         st.header("🧠 LLM Integration")
 
-        llm_service = LLMService()
+        llm_service = _cached_llm_service()
 
         project_options = {p.id: p.name for p in all_projects}
         selected_project_id_llm = st.selectbox("Select a Project for Context", options=[None] + list(project_options.keys()), format_func=lambda x: "General (No Context)" if x is None else project_options[x], key="llm_project_select")
@@ -634,8 +914,7 @@ def main_app():
                 if submitted_doc_prompt and doc_prompt:
                     with st.spinner("Generating document..."):
                         try:
-                            generated_doc = llm_service.generate_document(doc_prompt, selected_project_id_llm)
-                            st.write(generated_doc)
+                            _write_llm_response("document", doc_prompt, selected_project_id_llm, llm_service.generate_document_stream)
                         except Exception as e:
                             st.error(f"Error generating document: {e}")
 
@@ -646,168 +925,56 @@ def main_app():
                 if submitted_risk_desc and risk_desc_llm:
                     with st.spinner("Assessing risk..."):
                         try:
-                            risk_assessment = llm_service.assess_risk(risk_desc_llm, selected_project_id_llm)
-                            st.write(risk_assessment)
+                            _write_llm_response("risk", risk_desc_llm, selected_project_id_llm, llm_service.assess_risk_stream)
                         except Exception as e:
                             st.error(f"Error assessing risk: {e}")
 
+    with tab_llm:
+        if tab_llm.open:
+            render_llm_tab()
+
     # --- Reports & Export Tab ---
-    with tab_reports:
+    def render_reports_tab():
+        all_risks = _cached_risks()
+        all_controls = _cached_controls()
+        all_compliance_items = _cached_compliance_items()
+        risk_names = _cached_risk_names(_listing_signature(all_risks))
+
         st.header("Reports & Export")
 
         st.subheader("Export Data to CSV")
 
-        # Export Projects
-        if all_projects:
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                st.subheader("Projects Data Preview")
-            with col2:
-                st.download_button(
-                    label="Download Projects as CSV",
-                    data=pd.DataFrame([{"ID": p.id, "Name": p.name, "Description": p.description} for p in all_projects]).to_csv(index=False).encode('utf-8'),
-                    file_name="projects.csv",
-                    mime="text/csv",
-                )
-            projects_df = pd.DataFrame([{"ID": p.id, "Name": p.name, "Description": p.description} for p in all_projects])
-            st.dataframe(projects_df)
-        else:
-            st.info("No projects to export.")
+        exports = [
+            ("Projects", "projects.csv", ("ID", "Name", "Description"),
+             [(p.id, p.name, p.description) for p in all_projects]),
+            ("Risks", "risks.csv", ("ID", "Project ID", "Project Name", "Name", "Description", "Severity", "Likelihood", "Status"),
+             [(r.id, r.project_id, get_project_name(r.project_id), r.name, r.description, r.severity, r.likelihood, r.status) for r in all_risks]),
+            ("Controls", "controls.csv", ("ID", "Risk ID", "Risk Name", "Name", "Description", "Type", "Status"),
+             [(c.id, c.risk_id, risk_names.get(c.risk_id, "Unknown Risk"), c.name, c.description, c.type, c.status) for c in all_controls]),
+            ("Compliance Items", "compliance_items.csv", ("ID", "Project ID", "Project Name", "Name", "Description", "Standard", "Status"),
+             [(ci.id, ci.project_id, get_project_name(ci.project_id), ci.name, ci.description, ci.standard, ci.status) for ci in all_compliance_items]),
+        ]
+        for title, file_name, columns, rows in exports:
+            _export_section(title, file_name, len(rows), lambda: _export_table(columns, tuple(rows)))
+
+        # Audit logs are previewed from their newest page and exported through a streaming cursor
+        _export_section("Audit Logs", "audit_logs.csv", _cached_audit_log_count(), lambda: (
+            pd.DataFrame.from_records(
+                [(al.id, al.timestamp, al.project_id, get_project_name(al.project_id), al.action, al.details) for al in _cached_audit_log_page(None, PREVIEW_ROWS, 0)],
+                columns=AUDIT_LOG_EXPORT_COLUMNS
+            ),
+            functools.partial(_audit_log_csv, project_names),
+        ))
 
-        # Export Risks
-        if all_risks:
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                st.subheader("Risks Data Preview")
-            with col2:
-                st.download_button(
-                    label="Download Risks as CSV",
-                    data=pd.DataFrame([{
-                        "ID": r.id,
-                        "Project ID": r.project_id,
-                        "Project Name": get_project_name(r.project_id),
-                        "Name": r.name,
-                        "Description": r.description,
-                        "Severity": r.severity,
-                        "Likelihood": r.likelihood,
-                        "Status": r.status
-                    } for r in all_risks]).to_csv(index=False).encode('utf-8'),
-                    file_name="risks.csv",
-                    mime="text/csv",
-                )
-            risks_df = pd.DataFrame([{
-                "ID": r.id,
-                "Project ID": r.project_id,
-                "Project Name": get_project_name(r.project_id),
-                "Name": r.name,
-                "Description": r.description,
-                "Severity": r.severity,
-                "Likelihood": r.likelihood,
-                "Status": r.status
-            } for r in all_risks])
-            st.dataframe(risks_df)
-        else:
-            st.info("No risks to export.")
-
-        # Export Controls
-        if all_controls:
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                st.subheader("Controls Data Preview")
-            with col2:
-                st.download_button(
-                    label="Download Controls as CSV",
-                    data=pd.DataFrame([{
-                        "ID": c.id,
-                        "Risk ID": c.risk_id,
-                        "Risk Name": get_risk_name(c.risk_id),
-                        "Name": c.name,
-                        "Description": c.description,
-                        "Type": c.type,
-                        "Status": c.status
-                    } for c in all_controls]).to_csv(index=False).encode('utf-8'),
-                    file_name="controls.csv",
-                    mime="text/csv",
-                )
-            controls_df = pd.DataFrame([{
-                "ID": c.id,
-                "Risk ID": c.risk_id,
-                "Risk Name": get_risk_name(c.risk_id),
-                "Name": c.name,
-                "Description": c.description,
-                "Type": c.type,
-                "Status": c.status
-            } for c in all_controls])
-            st.dataframe(controls_df)
-        else:
-            st.info("No controls to export.")
-
-        # Export Compliance Items
-        if all_compliance_items:
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                st.subheader("Compliance Items Data Preview")
-            with col2:
-                st.download_button(
-                    label="Download Compliance Items as CSV",
-                    data=pd.DataFrame([{
-                        "ID": ci.id,
-                        "Project ID": ci.project_id,
-                        "Project Name": get_project_name(ci.project_id),
-                        "Name": ci.name,
-                        "Description": ci.description,
-                        "Standard": ci.standard,
-                        "Status": ci.status
-                    } for ci in all_compliance_items]).to_csv(index=False).encode('utf-8'),
-                    file_name="compliance_items.csv",
-                    mime="text/csv",
-                )
-            compliance_df = pd.DataFrame([{
-                "ID": ci.id,
-                "Project ID": ci.project_id,
-                "Project Name": get_project_name(ci.project_id),
-                "Name": ci.name,
-                "Description": ci.description,
-                "Standard": ci.standard,
-                "Status": ci.status
-            } for ci in all_compliance_items])
-            st.dataframe(compliance_df)
-        else:
-            st.info("No compliance items to export.")
-
-        # Export Audit Logs
-        if all_audit_logs:
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                st.subheader("Audit Logs Data Preview")
-            with col2:
-                st.download_button(
-                    label="Download Audit Logs as CSV",
-                    data=pd.DataFrame([{
-                        "ID": al.id,
-                        "Timestamp": al.timestamp,
-                        "Project ID": al.project_id,
-                        "Project Name": get_project_name(al.project_id),
-                        "Action": al.action,
-                        "Details": al.details
-                    } for al in all_audit_logs]).to_csv(index=False).encode('utf-8'),
-                    file_name="audit_logs.csv",
-                    mime="text/csv",
-                )
-            audit_logs_df = pd.DataFrame([{
-                "ID": al.id,
-                "Timestamp": al.timestamp,
-                "Project ID": al.project_id,
-                "Project Name": get_project_name(al.project_id),
-                "Action": al.action,
-                "Details": al.details
-            } for al in all_audit_logs])
-            st.dataframe(audit_logs_df)
-        else:
-            st.info("No audit logs to export.")
+    with tab_reports:
+        if tab_reports.open:
+            render_reports_tab()
 
     # --- User Management Tab (Admin Only) ---
-    with tab_users:
+    @st.fragment
+    def render_user_management_tab():
+        all_users = _cached_users()
+
         st.header("User Management")
         if st.session_state.user_id == 1: # Only the first user (super admin) can create new users
             st.subheader("Create New User")
@@ -820,7 +987,8 @@ def main_app():
                         try:
                             create_user(new_username, new_password)
                             st.success(f"User '{new_username}' created successfully!")
-                            st.rerun()
+                            _invalidate_all()
+                            _rerun_fragment()
                         except Exception as e:
                             st.error(f"Error creating user: {e}")
                     else:
@@ -828,15 +996,16 @@ def main_app():
 
             st.subheader("Existing Users")
             if all_users:
-                user_data = []
-                for user in all_users:
-                    user_data.append({"ID": user.id, "Username": user.username})
-                st.dataframe(pd.DataFrame(user_data))
+                st.dataframe(pd.DataFrame.from_records(all_users, columns=["ID", "Username"]))
             else:
                 st.info("No users found.")
         else:
             st.warning("You do not have permission to access this page.")
 
+    with tab_users:
+        if tab_users.open:
+            render_user_management_tab()
+
 
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
@@ -1,6 +1,7 @@
 # audit_logging.py
 
-from database import SessionLocal, AuditLog
+from database import SessionLocal, AuditLog, STREAM_BATCH_SIZE
+from sqlalchemy import func
 
 def create_audit_log(project_id, action, details):
     """Creates a new audit log entry."""
@@ -21,3 +22,34 @@ def get_audit_logs(project_id=None):
         logs = db.query(AuditLog).all()
     db.close()
     return logs
+
+def get_audit_log_page(project_id=None, limit=50, offset=0):
+    """Gets one page of audit log entries, newest first, optionally filtered by project."""
+    db = SessionLocal()
+    query = db.query(AuditLog)
+    if project_id:
+        query = query.filter(AuditLog.project_id == project_id)
+    logs = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit).offset(offset).all()
+    db.close()
+    return logs
+
+def count_audit_logs(project_id=None):
+    """Counts audit log entries, optionally filtered by project."""
+    db = SessionLocal()
+    query = db.query(func.count(AuditLog.id))
+    if project_id:
+        query = query.filter(AuditLog.project_id == project_id)
+    count = query.scalar()
+    db.close()
+    return count
+
+def iter_audit_logs(project_id=None):
+    """Yields audit log entries as plain column rows in batches, optionally filtered by project."""
+    db = SessionLocal()
+    try:
+        query = db.query(*AuditLog.__table__.columns)
+        if project_id:
+            query = query.filter(AuditLog.project_id == project_id)
+        yield from query.yield_per(STREAM_BATCH_SIZE)
+    finally:
+        db.close()
@@ -1,9 +1,12 @@
 # compliance_management.py
 
-from database import SessionLocal, Compliance, Project, Risk, Document
+import logging
+from sqlalchemy import func, insert
+from sqlalchemy.orm import selectinload
+from database import SessionLocal, Compliance, Project, Risk, Document, AuditLog, STREAM_BATCH_SIZE
 from services.audit_logging import create_audit_log
-from services.risk_management import get_risks
-from services.document_management import get_documents
+
+logger = logging.getLogger(__name__)
 
 def create_compliance_item(project_id, name, description, standard, status):
     """Creates a new compliance item."""
@@ -16,6 +19,25 @@ def create_compliance_item(project_id, name, description, standard, status):
     create_audit_log(project_id, "Compliance Item Created", f"Compliance item '{name}' was created for project ID {project_id}.")
     return compliance_item
 
+def create_compliance_items_bulk(rows):
+    """Creates many compliance items, and their audit log entries, in a single transaction.
+    Each row is a dict of Compliance column values. Returns the number of items created.
+    """
+    if not rows:
+        return 0
+    db = SessionLocal()
+    try:
+        db.execute(insert(Compliance), rows)
+        db.execute(insert(AuditLog), [
+            {"project_id": row.get("project_id"), "action": "Compliance Item Created",
+             "details": f"Compliance item '{row.get('name')}' was created for project ID {row.get('project_id')}."}
+            for row in rows
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return len(rows)
+
 def get_compliance_items(project_id=None):
     """Gets all compliance items, optionally filtered by project."""
     db = SessionLocal()
@@ -26,6 +48,25 @@ def get_compliance_items(project_id=None):
     db.close()
     return compliance_items
 
+def get_compliance_status_counts():
+    """Returns a {status: compliance item count} dict for all items, most common first, in one query."""
+    db = SessionLocal()
+    count = func.count(Compliance.id)
+    counts = dict(db.query(Compliance.status, count).group_by(Compliance.status).order_by(count.desc()).all())
+    db.close()
+    return counts
+
+def iter_compliance_items(project_id=None):
+    """Yields compliance items as plain column rows in batches, optionally filtered by project."""
+    db = SessionLocal()
+    try:
+        query = db.query(*Compliance.__table__.columns)
+        if project_id:
+            query = query.filter(Compliance.project_id == project_id)
+        yield from query.yield_per(STREAM_BATCH_SIZE)
+    finally:
+        db.close()
+
 def update_compliance_item(compliance_item_id, name=None, description=None, standard=None, status=None):
     """Updates an existing compliance item."""
     db = SessionLocal()
@@ -68,25 +109,31 @@ def automate_compliance_check(project_id: int = None):
     db = SessionLocal()
     updated_count = 0
     try:
-        query = db.query(Compliance)
+        # Each item is checked against its project's documents and risks, so load
+        # those up front (one SELECT ... IN per relationship) instead of
+        # re-querying them for every item
+        query = db.query(Compliance).options(
+            selectinload(Compliance.project).selectinload(Project.documents),
+            selectinload(Compliance.project).selectinload(Project.risks),
+        )
         if project_id:
             query = query.filter(Compliance.project_id == project_id)
         
         compliance_items = query.all()
-        print(f"DEBUG: Processing {len(compliance_items)} compliance items for project ID {project_id if project_id else 'all'}.")
+        logger.debug("Processing %d compliance items for project ID %s.", len(compliance_items), project_id if project_id else "all")
 
         for item in compliance_items:
-            print(f"DEBUG: Checking compliance item: {item.name} (ID: {item.id}), Current Status: {item.status}")
+            logger.debug("Checking compliance item: %s (ID: %s), Current Status: %s", item.name, item.id, item.status)
             original_status = item.status
             new_status = original_status
 
             # Rule 1: Check linked documents
-            documents = get_documents(item.project_id) # Get all documents for the project
-            print(f"DEBUG: Found {len(documents)} documents for project ID {item.project_id}.")
+            documents = item.project.documents if item.project else [] # All documents for the project
+            logger.debug("Found %d documents for project ID %s.", len(documents), item.project_id)
             for doc in documents:
-                print(f"DEBUG: Comparing '{item.name.lower()}' with document '{doc.name.lower()}', Approval Status: {doc.approval_status}")
+                logger.debug("Comparing '%s' with document '%s', Approval Status: %s", item.name.lower(), doc.name.lower(), doc.approval_status)
                 if item.name.lower() in doc.name.lower() and doc.approval_status == "Approved":
-                    print(f"DEBUG: Document match found! '{doc.name}' is approved and contains '{item.name}'. Setting status to Compliant.")
+                    logger.debug("Document match found! '%s' is approved and contains '%s'. Setting status to Compliant.", doc.name, item.name)
                     new_status = "Compliant"
                     break
             
@@ -95,17 +142,17 @@ def automate_compliance_check(project_id: int = None):
                     item.status = new_status
                     db.add(item)
                     updated_count += 1
-                    print(f"DEBUG: Updated compliance item {item.name} to {new_status} due to document.")
+                    logger.debug("Updated compliance item %s to %s due to document.", item.name, new_status)
                     create_audit_log(item.project_id, "Compliance Auto-Checked", f"Compliance item '{item.name}' (ID: {item.id}) status automatically updated to '{new_status}' due to linked approved document.")
                 continue # Move to next compliance item
 
             # Rule 2: Check linked risks
-            risks = get_risks(item.project_id) # Get all risks for the project
-            print(f"DEBUG: Found {len(risks)} risks for project ID {item.project_id}.")
+            risks = item.project.risks if item.project else [] # All risks for the project
+            logger.debug("Found %d risks for project ID %s.", len(risks), item.project_id)
             for risk in risks:
-                print(f"DEBUG: Comparing '{item.name.lower()}' with risk '{risk.name.lower()}', Risk Status: {risk.status}")
+                logger.debug("Comparing '%s' with risk '%s', Risk Status: %s", item.name.lower(), risk.name.lower(), risk.status)
                 if item.name.lower() in risk.name.lower() and risk.status in ["Mitigated", "Closed"]:
-                    print(f"DEBUG: Risk match found! '{risk.name}' is mitigated/closed and contains '{item.name}'. Setting status to Compliant.")
+                    logger.debug("Risk match found! '%s' is mitigated/closed and contains '%s'. Setting status to Compliant.", risk.name, item.name)
                     new_status = "Compliant"
                     break
             
@@ -113,7 +160,7 @@ def automate_compliance_check(project_id: int = None):
                 item.status = new_status
                 db.add(item)
                 updated_count += 1
-                print(f"DEBUG: Updated compliance item {item.name} to {new_status} due to risk.")
+                logger.debug("Updated compliance item %s to %s due to risk.", item.name, new_status)
                 create_audit_log(item.project_id, "Compliance Auto-Checked", f"Compliance item '{item.name}' (ID: {item.id}) status automatically updated to '{new_status}' due to linked mitigated/closed risk.")
 
         db.commit()
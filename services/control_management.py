@@ -1,6 +1,8 @@
 # control_management.py
 
-from database import SessionLocal, Control, Risk
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+from database import SessionLocal, Control, Risk, AuditLog, STREAM_BATCH_SIZE
 from services.audit_logging import create_audit_log
 
 def create_control(risk_id, name, description, type, status):
@@ -17,6 +19,27 @@ def create_control(risk_id, name, description, type, status):
     create_audit_log(project_id, "Control Created", f"Control '{name}' was created for risk ID {risk_id}.")
     return control
 
+def create_controls_bulk(rows):
+    """Creates many controls, and their audit log entries, in a single transaction.
+    Each row is a dict of Control column values. Returns the number of controls created.
+    """
+    if not rows:
+        return 0
+    db = SessionLocal()
+    try:
+        risk_ids = {row.get("risk_id") for row in rows}
+        project_ids = dict(db.query(Risk.id, Risk.project_id).filter(Risk.id.in_(risk_ids)).all())
+        db.execute(insert(Control), rows)
+        db.execute(insert(AuditLog), [
+            {"project_id": project_ids.get(row.get("risk_id")), "action": "Control Created",
+             "details": f"Control '{row.get('name')}' was created for risk ID {row.get('risk_id')}."}
+            for row in rows
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return len(rows)
+
 def get_controls(risk_id=None):
     """Gets all controls, optionally filtered by risk."""
     db = SessionLocal()
@@ -27,10 +50,21 @@ def get_controls(risk_id=None):
     db.close()
     return controls
 
+def iter_controls(risk_id=None):
+    """Yields controls as plain column rows in batches, optionally filtered by risk."""
+    db = SessionLocal()
+    try:
+        query = db.query(*Control.__table__.columns)
+        if risk_id:
+            query = query.filter(Control.risk_id == risk_id)
+        yield from query.yield_per(STREAM_BATCH_SIZE)
+    finally:
+        db.close()
+
 def update_control(control_id, name=None, description=None, type=None, status=None):
     """Updates an existing control."""
     db = SessionLocal()
-    control = db.query(Control).filter(Control.id == control_id).first()
+    control = db.query(Control).options(joinedload(Control.risk)).filter(Control.id == control_id).first()
     if control:
         project_id = control.risk.project_id if control.risk else None
         if name: control.name = name
@@ -48,7 +82,7 @@ def update_control(control_id, name=None, description=None, type=None, status=No
 def delete_control(control_id):
     """Deletes a control."""
     db = SessionLocal()
-    control = db.query(Control).filter(Control.id == control_id).first()
+    control = db.query(Control).options(joinedload(Control.risk)).filter(Control.id == control_id).first()
     if control:
         project_id = control.risk.project_id if control.risk else None
         control_name = control.name
@@ -1,42 +1,87 @@
 # document_management.py
 
+import io
+import logging
 import os
+import shutil
 import uuid
-from database import SessionLocal, Document
+from sqlalchemy import insert
+from database import SessionLocal, Document, AuditLog, STREAM_BATCH_SIZE
 from services.audit_logging import create_audit_log
 import datetime
 
+logger = logging.getLogger(__name__)
+
 # Define the directory for storing uploaded documents
 DOCUMENT_STORAGE_DIR = "./documents_storage"
 
-def _save_file_to_storage(file_content: bytes, original_filename: str) -> str:
-    """Saves the file content to local storage and returns the full path."""
+# Chunk size used when copying uploaded file objects into storage
+FILE_COPY_CHUNK_SIZE = 1024 * 1024
+
+def _copy_file_obj(src, dst):
+    """Copies a readable binary file object into dst without loading it into memory.
+    Uses os.sendfile for a zero-copy transfer when src is backed by a real file.
+    """
+    try:
+        src_fd = src.fileno()
+        offset = src.tell()
+        size = os.fstat(src_fd).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        src_fd = None
+
+    if src_fd is not None and hasattr(os, "sendfile"):
+        dst.flush()
+        try:
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except OSError:
+            # Fall back to a buffered copy from wherever sendfile stopped
+            src.seek(offset)
+    shutil.copyfileobj(src, dst, FILE_COPY_CHUNK_SIZE)
+
+def _save_file_to_storage(file_content: bytes, original_filename: str, file_obj=None) -> str:
+    """Saves the file content to local storage and returns the full path.
+    If file_obj is provided, it is streamed to storage instead of file_content.
+    """
     os.makedirs(DOCUMENT_STORAGE_DIR, exist_ok=True)
     unique_filename = f"{uuid.uuid4()}_{original_filename}"
     file_path = os.path.join(DOCUMENT_STORAGE_DIR, unique_filename)
     with open(file_path, "wb") as f:
-        f.write(file_content)
+        if file_obj is not None:
+            _copy_file_obj(file_obj, f)
+        else:
+            f.write(file_content)
     return file_path
 
+def original_filename_from_link(file_path: str) -> str:
+    """Returns the uploaded file's original name from a path made by _save_file_to_storage."""
+    return os.path.basename(file_path).split("_", 1)[-1]
+
 def _delete_file_from_storage(file_path: str):
     """Deletes a file from local storage if it exists."""
     if file_path and os.path.exists(file_path):
         try:
             os.remove(file_path)
-            print(f"DEBUG: Deleted file: {file_path}")
+            logger.debug("Deleted file: %s", file_path)
         except Exception as e:
-            print(f"ERROR: Could not delete file {file_path}: {e}")
+            logger.error("Could not delete file %s: %s", file_path, e)
 
-def create_document(project_id, name, type, version, file_content=None, original_filename=None, approval_status="Pending", approved_by=None, approval_date=None):
+def create_document(project_id, name, type, version, file_content=None, original_filename=None, approval_status="Pending", approved_by=None, approval_date=None, file_obj=None):
     """Creates a new document record and saves the file content to storage.
-    If file_content is provided, link will be the path to the stored file.
+    The content can be given as bytes (file_content) or as a readable binary
+    file object (file_obj), which is streamed to storage in chunks.
+    If either is provided, link will be the path to the stored file.
     Otherwise, link will be None or an empty string.
     """
     db = SessionLocal()
     file_path = None
-    if file_content and original_filename:
+    if (file_content or file_obj is not None) and original_filename:
         try:
-            file_path = _save_file_to_storage(file_content, original_filename)
+            file_path = _save_file_to_storage(file_content, original_filename, file_obj)
         except Exception as e:
             db.close()
             create_audit_log(project_id, "Document Creation Failed", f"Failed to save document file for '{name}': {e}")
@@ -53,12 +98,54 @@ def create_document(project_id, name, type, version, file_content=None, original
         approval_date=approval_date
     )
     db.add(doc)
-    db.commit()
+    try:
+        db.commit()
+    except Exception:
+        if file_path:
+            _delete_file_from_storage(file_path)
+        db.close()
+        raise
     db.refresh(doc)
     db.close()
     create_audit_log(project_id, "Document Created", f"Document '{name}' (Type: {type}, Version: {version}) created for project ID {project_id}. File saved at {file_path or 'N/A'}.")
     return doc
 
+def create_documents_bulk(rows):
+    """Creates many document records, and their audit log entries, in a single transaction.
+    Each row is a dict of Document column values plus an optional file_path; each
+    file is opened and streamed to storage in turn, and the stored files are
+    removed again if the batch fails. Returns the number of documents created.
+    """
+    if not rows:
+        return 0
+    db = SessionLocal()
+    values = []
+    stored_paths = []
+    try:
+        for row in rows:
+            row = dict(row)
+            file_path = row.pop("file_path", None)
+            row["link"] = None
+            if file_path:
+                with open(file_path, "rb") as file_obj:
+                    row["link"] = _save_file_to_storage(None, os.path.basename(file_path), file_obj)
+                stored_paths.append(row["link"])
+            values.append(row)
+        db.execute(insert(Document), values)
+        db.execute(insert(AuditLog), [
+            {"project_id": row.get("project_id"), "action": "Document Created",
+             "details": f"Document '{row.get('name')}' (Type: {row.get('type')}, Version: {row.get('version', '1.0')}) created for project ID {row.get('project_id')}. File saved at {row.get('link') or 'N/A'}."}
+            for row in values
+        ])
+        db.commit()
+    except Exception:
+        for stored_path in stored_paths:
+            _delete_file_from_storage(stored_path)
+        raise
+    finally:
+        db.close()
+    return len(values)
+
 def get_documents(project_id=None):
     """Gets all document records, optionally filtered by project."""
     db = SessionLocal()
@@ -69,9 +156,21 @@ def get_documents(project_id=None):
     db.close()
     return docs
 
-def update_document(doc_id, name=None, type=None, version=None, file_content=None, original_filename=None, approval_status=None, approved_by=None, approval_date=None):
+def iter_documents(project_id=None):
+    """Yields document records as plain column rows in batches, optionally filtered by project."""
+    db = SessionLocal()
+    try:
+        query = db.query(*Document.__table__.columns)
+        if project_id:
+            query = query.filter(Document.project_id == project_id)
+        yield from query.yield_per(STREAM_BATCH_SIZE)
+    finally:
+        db.close()
+
+def update_document(doc_id, name=None, type=None, version=None, file_content=None, original_filename=None, approval_status=None, approved_by=None, approval_date=None, file_obj=None, link=None):
     """Updates an existing document record and its associated file content.
-    If new file_content is provided, the old file will be deleted and a new one saved.
+    If new file_content (or a readable file_obj) is provided, the old file will be deleted and a new one saved.
+    Passing link="" without new content removes the stored file.
     """
     db = SessionLocal()
     doc = db.query(Document).filter(Document.id == doc_id).first()
@@ -83,9 +182,9 @@ def update_document(doc_id, name=None, type=None, version=None, file_content=Non
         if version: doc.version = version
         
         # Handle file content update
-        if file_content and original_filename:
+        if (file_content or file_obj is not None) and original_filename:
             try:
-                new_file_path = _save_file_to_storage(file_content, original_filename)
+                new_file_path = _save_file_to_storage(file_content, original_filename, file_obj)
                 doc.link = new_file_path # Update link to new file
                 _delete_file_from_storage(original_file_path) # Delete old file
             except Exception as e:
@@ -3,9 +3,7 @@
 import google.generativeai as genai
 import os
 from dotenv import load_dotenv
-from services.project_management import get_project_by_id, get_work_packages
-from services.risk_management import get_risks
-from services.document_management import get_documents
+from services.project_management import get_project_overview
 
 class LLMService:
     def __init__(self):
@@ -18,13 +16,13 @@ class LLMService:
 
     def _get_project_context(self, project_id):
         """Helper function to gather context for a given project."""
-        project = get_project_by_id(project_id)
+        project = get_project_overview(project_id)
         if not project:
             return ""
 
-        work_packages = get_work_packages(project_id)
-        risks = get_risks(project_id)
-        documents = get_documents(project_id)
+        work_packages = project.work_packages
+        risks = project.risks
+        documents = project.documents
 
         context = f"""Project Name: {project.name}
 Project Description: {project.description}
@@ -44,8 +42,8 @@ Work Packages:
         
         return context
 
-    def generate_document(self, prompt, project_id=None):
-        """Generates a document based on the given prompt, with optional project context."""
+    def _document_prompt(self, prompt, project_id=None):
+        """Builds the document generation prompt, with optional project context."""
         final_prompt = prompt
         if project_id:
             context = self._get_project_context(project_id)
@@ -61,14 +59,27 @@ Work Packages:
 
 **Generated Document:**
 """
+        return final_prompt
+
+    def generate_document(self, prompt, project_id=None):
+        """Generates a document based on the given prompt, with optional project context."""
+        final_prompt = self._document_prompt(prompt, project_id)
         try:
             response = self.model.generate_content(final_prompt)
             return response.text
         except Exception as e:
             return f"Error generating document: {e}"
 
-    def assess_risk(self, risk_description, project_id=None):
-        """Assesses a risk based on its description, with optional project context."""
+    def generate_document_stream(self, prompt, project_id=None):
+        """Same as generate_document, but yields the text in chunks as the model produces it.
+        Errors are raised rather than yielded, so a failed stream can't pass for a complete response.
+        """
+        final_prompt = self._document_prompt(prompt, project_id)
+        for chunk in self.model.generate_content(final_prompt, stream=True):
+            yield chunk.text
+
+    def _risk_prompt(self, risk_description, project_id=None):
+        """Builds the risk assessment prompt, with optional project context."""
         context_prompt = ""
         if project_id:
             context = self._get_project_context(project_id)
@@ -88,12 +99,25 @@ Work Packages:
 
 **Assessment:**
 """
+        return prompt
+
+    def assess_risk(self, risk_description, project_id=None):
+        """Assesses a risk based on its description, with optional project context."""
+        prompt = self._risk_prompt(risk_description, project_id)
         try:
             response = self.model.generate_content(prompt)
             return response.text
         except Exception as e:
             return f"Error assessing risk: {e}"
 
+    def assess_risk_stream(self, risk_description, project_id=None):
+        """Same as assess_risk, but yields the text in chunks as the model produces it.
+        Errors are raised rather than yielded, so a failed stream can't pass for a complete response.
+        """
+        prompt = self._risk_prompt(risk_description, project_id)
+        for chunk in self.model.generate_content(prompt, stream=True):
+            yield chunk.text
+
     def answer_project_question(self, question, context):
         """Answers a question based on the provided context using RAG."""
         prompt = f"""
@@ -1,8 +1,7 @@
-from database import SessionLocal, Project, WorkPackage, Risk, Compliance, Document
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload, undefer, undefer_group
+from database import SessionLocal, Project, WorkPackage, Risk, Compliance, Document, STREAM_BATCH_SIZE
 from services.audit_logging import create_audit_log
-from services.risk_management import get_risks
-from services.compliance_management import get_compliance_items
-from services.document_management import get_documents
 import datetime
 
 def create_project(name, description, pin_id=None, scope=None, milestones=None, start_date=None, end_date=None, effort_estimation=None, deliverables=None, team_members=None, team_size=None, roles_responsibilities=None, sdlc_model=None, ciso_approved=False, ciso_approval_date=None):
@@ -33,16 +32,49 @@ def create_project(name, description, pin_id=None, scope=None, milestones=None,
     return project
 
 def get_projects():
-    """Gets all projects."""
+    """Gets all projects. Of the deferred PIN details only scope is loaded;
+    use get_project_by_id for the rest.
+    """
     db = SessionLocal()
-    projects = db.query(Project).all()
+    projects = db.query(Project).options(undefer(Project.scope)).all()
     db.close()
     return projects
 
+def iter_projects():
+    """Yields all projects as plain column rows, fetched in batches."""
+    db = SessionLocal()
+    try:
+        yield from db.query(*Project.__table__.columns).yield_per(STREAM_BATCH_SIZE)
+    finally:
+        db.close()
+
 def get_project_by_id(project_id):
-    """Gets a project by its ID."""
+    """Gets a project by its ID, including its PIN details."""
     db = SessionLocal()
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(undefer_group("details")).filter(Project.id == project_id).first()
+    db.close()
+    return project
+
+def get_project_bundle(project_id):
+    """Retrieves a project with its work packages, compliance items and documents loaded, in one session."""
+    db = SessionLocal()
+    project = db.query(Project).options(
+        undefer_group("details"),
+        selectinload(Project.work_packages),
+        selectinload(Project.compliance_items),
+        selectinload(Project.documents),
+    ).filter(Project.id == project_id).first()
+    db.close()
+    return project
+
+def get_project_overview(project_id):
+    """Retrieves a project with its work packages, risks and documents loaded, in one session."""
+    db = SessionLocal()
+    project = db.query(Project).options(
+        selectinload(Project.work_packages),
+        selectinload(Project.risks),
+        selectinload(Project.documents),
+    ).filter(Project.id == project_id).first()
     db.close()
     return project
 
@@ -92,6 +124,21 @@ def get_work_packages(project_id):
     db.close()
     return work_packages
 
+def get_work_package_counts():
+    """Returns a {project_id: work package count} dict for all projects, in one query."""
+    db = SessionLocal()
+    counts = dict(db.query(WorkPackage.project_id, func.count(WorkPackage.id)).group_by(WorkPackage.project_id).all())
+    db.close()
+    return counts
+
+def iter_work_packages(project_id):
+    """Yields the work packages for a project as plain column rows in batches."""
+    db = SessionLocal()
+    try:
+        yield from db.query(*WorkPackage.__table__.columns).filter(WorkPackage.project_id == project_id).yield_per(STREAM_BATCH_SIZE)
+    finally:
+        db.close()
+
 def generate_project_status_report(project_id: int) -> str:
     """
     Generates a comprehensive status report for a given project using LLM.
@@ -103,7 +150,15 @@ def generate_project_status_report(project_id: int) -> str:
     report_content = []
 
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        # Load the project and everything the report lists in one session, one
+        # SELECT ... IN query per collection
+        project = db.query(Project).options(
+            undefer_group("details"),
+            selectinload(Project.work_packages),
+            selectinload(Project.risks),
+            selectinload(Project.compliance_items),
+            selectinload(Project.documents),
+        ).filter(Project.id == project_id).first()
         if not project:
             return f"Error: Project with ID {project_id} not found."
 
@@ -126,7 +181,7 @@ def generate_project_status_report(project_id: int) -> str:
         report_content.append(f"- CISO Approval Date: {project.ciso_approval_date or 'N/A'}")
 
         # Work Packages
-        work_packages = get_work_packages(project_id)
+        work_packages = project.work_packages
         report_content.append("\n### Work Packages:")
         if work_packages:
             for wp in work_packages:
@@ -135,7 +190,7 @@ def generate_project_status_report(project_id: int) -> str:
             report_content.append("No work packages found.")
 
         # Risks
-        risks = get_risks(project_id)
+        risks = project.risks
         report_content.append("\n### Risks:")
         if risks:
             for risk in risks:
@@ -144,7 +199,7 @@ def generate_project_status_report(project_id: int) -> str:
             report_content.append("No risks found.")
 
         # Compliance Items
-        compliance_items = get_compliance_items(project_id)
+        compliance_items = project.compliance_items
         report_content.append("\n### Compliance Items:")
         if compliance_items:
             for item in compliance_items:
@@ -153,7 +208,7 @@ def generate_project_status_report(project_id: int) -> str:
             report_content.append("No compliance items found.")
 
         # Documents
-        documents = get_documents(project_id)
+        documents = project.documents
         report_content.append("\n### Documents:")
         if documents:
             for doc in documents:
@@ -1,6 +1,7 @@
 # risk_management.py
 
-from database import SessionLocal, Risk
+from sqlalchemy import func, insert
+from database import SessionLocal, Risk, AuditLog, STREAM_BATCH_SIZE
 from services.audit_logging import create_audit_log
 
 def create_risk(project_id, name, description, severity, likelihood, status):
@@ -14,6 +15,25 @@ def create_risk(project_id, name, description, severity, likelihood, status):
     create_audit_log(project_id, "Risk Created", f"Risk '{name}' was created for project ID {project_id}.")
     return risk
 
+def create_risks_bulk(rows):
+    """Creates many risks, and their audit log entries, in a single transaction.
+    Each row is a dict of Risk column values. Returns the number of risks created.
+    """
+    if not rows:
+        return 0
+    db = SessionLocal()
+    try:
+        db.execute(insert(Risk), rows)
+        db.execute(insert(AuditLog), [
+            {"project_id": row.get("project_id"), "action": "Risk Created",
+             "details": f"Risk '{row.get('name')}' was created for project ID {row.get('project_id')}."}
+            for row in rows
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return len(rows)
+
 def get_risks(project_id=None):
     """Gets all risks, optionally filtered by project."""
     db = SessionLocal()
@@ -24,6 +44,25 @@ def get_risks(project_id=None):
     db.close()
     return risks
 
+def get_risk_severity_counts():
+    """Returns a {severity: risk count} dict for all risks, most common first, in one query."""
+    db = SessionLocal()
+    count = func.count(Risk.id)
+    counts = dict(db.query(Risk.severity, count).group_by(Risk.severity).order_by(count.desc()).all())
+    db.close()
+    return counts
+
+def iter_risks(project_id=None):
+    """Yields risks as plain column rows in batches, optionally filtered by project."""
+    db = SessionLocal()
+    try:
+        query = db.query(*Risk.__table__.columns)
+        if project_id:
+            query = query.filter(Risk.project_id == project_id)
+        yield from query.yield_per(STREAM_BATCH_SIZE)
+    finally:
+        db.close()
+
 def update_risk(risk_id, name=None, description=None, severity=None, likelihood=None, status=None):
     """Updates an existing risk."""
     db = SessionLocal()
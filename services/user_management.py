@@ -1,6 +1,7 @@
 # user_management.py
 
-from database import SessionLocal, User, UserProjectRole, ProjectRole
+from database import SessionLocal, User, UserProjectRole, ProjectRole, STREAM_BATCH_SIZE, check_dummy_password
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import joinedload
 
 def create_user(username, password):
@@ -15,12 +16,24 @@ def create_user(username, password):
     return user
 
 def authenticate_user(username, password):
-    """Authenticates a user by username and password."""
+    """Authenticates a user by username and password.
+    Upgrades the stored hash to the current method on a successful login.
+    """
     db = SessionLocal()
     user = db.query(User).filter_by(username=username).first()
-    db.close()
-    if user and user.check_password(password):
+    if user is None:
+        # Hash anyway so unknown usernames can't be told apart by response time
+        check_dummy_password(password)
+        db.close()
+        return None
+    if user.check_password(password):
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.commit()
+            db.refresh(user)
+        db.close()
         return user
+    db.close()
     return None
 
 def get_all_users():
@@ -30,10 +43,18 @@ def get_all_users():
     db.close()
     return users
 
+def iter_users():
+    """Yields the id and username of all users as plain rows, fetched in batches."""
+    db = SessionLocal()
+    try:
+        yield from db.query(User.id, User.username).yield_per(STREAM_BATCH_SIZE)
+    finally:
+        db.close()
+
 def add_user_to_project(user_id, project_id, role: ProjectRole):
     """Adds a user to a project with a specific role."""
     db = SessionLocal()
-    user_project_role = UserProjectRole(user_id=user_id, project_id=project_id, role=role)
+    user_project_role = UserProjectRole(user_id=user_id, project_id=project_id, role=ProjectRole(role).value)
     db.add(user_project_role)
     db.commit()
     db.close()
@@ -50,9 +71,20 @@ def remove_user_from_project(user_id, project_id):
 def get_user_role_for_project(user_id, project_id):
     """Gets a user's role for a specific project."""
     db = SessionLocal()
-    user_project_role = db.query(UserProjectRole).filter_by(user_id=user_id, project_id=project_id).first()
+    # Runs on every page render; lambda_stmt reuses the built statement, with
+    # user_id and project_id extracted as bound parameters
+    role = db.execute(lambda_stmt(
+        lambda: select(UserProjectRole.role).where(UserProjectRole.user_id == user_id, UserProjectRole.project_id == project_id)
+    )).scalar()
+    db.close()
+    return role
+
+def get_project_members(project_id):
+    """Gets the username and role of each user on a project as plain rows, in one joined query."""
+    db = SessionLocal()
+    members = db.query(User.username, UserProjectRole.role).join(UserProjectRole.user).filter(UserProjectRole.project_id == project_id).all()
     db.close()
-    return user_project_role.role if user_project_role else None
+    return members
 
 def get_users_for_project(project_id):
     """Gets all users and their roles for a specific project."""